@@ -0,0 +1,38 @@
+import os
+import sys
+import timeit
+
+import django
+from django.conf import settings
+
+
+def setup(*apps):
+    """Configure a throwaway in-memory Django project and migrate it."""
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY='benchmarks',
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+        INSTALLED_APPS=[
+            'django.contrib.auth',
+            'django.contrib.contenttypes',
+            'rest_framework',
+            'guardian',
+        ] + list(apps),
+        AUTHENTICATION_BACKENDS=(
+            'django.contrib.auth.backends.ModelBackend',
+            'guardian.backends.ObjectPermissionBackend',
+        ),
+        DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+        USE_TZ=True,
+    )
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', run_syncdb=True, verbosity=0)
+
+
+def report(label, func, operations, repeat=5):
+    """Time ``func`` (which performs ``operations`` operations) and print the best per-op time."""
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print('%-50s %10.2f us/op' % (label, best / operations * 1000000))
+    return best
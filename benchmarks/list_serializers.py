@@ -0,0 +1,85 @@
+"""
+Compare list serialization throughput of a generated detail serializer and of its summary list serializer.
+
+Rows are built in memory so that only serialization is measured.
+
+    python benchmarks/list_serializers.py [rows]
+"""
+import sys
+
+from common import report, setup
+
+setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+
+from django_rest_generators import mixins  # noqa: E402
+
+
+class Detail(serializers.ModelSerializer):
+    id = serializers.IntegerField(read_only=True, required=False, allow_null=False)
+    username = serializers.CharField(max_length=150, read_only=False, required=True, allow_null=False)
+    first_name = serializers.CharField(max_length=150, read_only=False, required=False, allow_null=False)
+    last_name = serializers.CharField(max_length=150, read_only=False, required=False, allow_null=False)
+    email = serializers.EmailField(read_only=False, required=False, allow_null=False)
+    is_staff = serializers.BooleanField(read_only=False, required=False, allow_null=False)
+    is_active = serializers.BooleanField(read_only=False, required=False, allow_null=False)
+    date_joined = serializers.DateTimeField(read_only=False, required=False, allow_null=False)
+    last_login = serializers.DateTimeField(read_only=False, required=False, allow_null=True)
+
+    class Meta(object):
+        model = User
+        fields = (
+            'id',
+            'username',
+            'first_name',
+            'last_name',
+            'email',
+            'is_staff',
+            'is_active',
+            'date_joined',
+            'last_login'
+        )
+
+
+class Summary(mixins.SummarySerializerMixin, serializers.BaseSerializer):
+    class Meta(object):
+        serializer = Detail
+        fields = (
+            'id',
+            'username',
+            'email'
+        )
+
+
+class FullSummary(mixins.SummarySerializerMixin, serializers.BaseSerializer):
+    class Meta(object):
+        serializer = Detail
+        fields = Detail.Meta.fields
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    now = timezone.now()
+    users = [
+        User(
+            id=index,
+            username='user%d' % index,
+            first_name='First',
+            last_name='Last',
+            email='user%d@example.com' % index,
+            date_joined=now,
+            last_login=now
+        ) for index in range(rows)
+    ]
+    detail = report('detail serializer', lambda: Detail(users, many=True).data, rows)
+    full = report('list serializer, every field', lambda: FullSummary(users, many=True).data, rows)
+    summary = report('list serializer, summary fields', lambda: Summary(users, many=True).data, rows)
+    print('%-50s %10.2fx' % ('speedup, every field', detail / full))
+    print('%-50s %10.2fx' % ('speedup, summary fields', detail / summary))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare the DRG permission classes against the stock DRF ones.
+
+Each request runs the permission checks several times, as nested serializers
+and bulk actions do, so the per-request memoization shows up in the numbers.
+
+    python benchmarks/permissions.py
+"""
+from common import report, setup
+
+setup()
+
+from django.contrib.auth.models import Group, Permission, User  # noqa: E402
+from guardian.shortcuts import assign_perm  # noqa: E402
+from rest_framework import permissions  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from django_rest_generators import permissions as drg  # noqa: E402
+
+CHECKS_PER_REQUEST = 10
+REQUESTS = 200
+
+
+class StockModelPermissionsWithRead(permissions.DjangoModelPermissions):
+    perms_map = drg.DjangoModelPermissionsWithRead.perms_map
+
+
+class StockObjectPermissionsWithRead(permissions.DjangoObjectPermissions):
+    perms_map = drg.DjangoObjectPermissionsWithRead.perms_map
+
+
+class View(object):
+    queryset = Group.objects.all()
+
+
+def main():
+    user = User.objects.create_user('bench')
+    user.user_permissions.add(Permission.objects.get(codename='view_group'))
+    group = Group.objects.create(name='bench')
+    assign_perm('auth.view_group', user, group)
+    factory = APIRequestFactory()
+    view = View()
+
+    def make_request():
+        request = Request(factory.get('/'))
+        request.user = User.objects.get(pk=user.pk)
+        return request
+
+    requests = [make_request() for _ in range(REQUESTS)]
+
+    def run(permission, method):
+        def bench():
+            for request in requests:
+                request.__dict__.pop('_drg_permission_decisions', None)
+                request.__dict__.pop('_drg_permission_checker', None)
+                for _ in range(CHECKS_PER_REQUEST):
+                    method(permission, request, view)
+        return bench
+
+    def has_permission(permission, request, view):
+        permission.has_permission(request, view)
+
+    def has_object_permission(permission, request, view):
+        permission.has_object_permission(request, view, group)
+
+    operations = REQUESTS * CHECKS_PER_REQUEST
+    for label, stock, memoized in (
+            ('model', StockModelPermissionsWithRead, drg.DjangoModelPermissionsWithRead),
+            ('object', StockObjectPermissionsWithRead, drg.DjangoObjectPermissionsWithRead)):
+        for check in (has_permission, has_object_permission):
+            if label == 'model' and check is has_object_permission:
+                continue
+            stock_time = report('%s %s (DRF)' % (label, check.__name__), run(stock(), check), operations)
+            drg_time = report('%s %s (DRG)' % (label, check.__name__), run(memoized(), check), operations)
+            print('%-50s %10.2fx' % ('speedup', stock_time / drg_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare insert throughput and index size of the primary keys offered by ``create_model --pk`` on SQLite.
+
+Tables use the same column definitions Django creates for each key type, with a small page cache so that index
+locality matters like it does on a table larger than memory.
+
+    python benchmarks/primary_keys.py [rows]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django_rest_generators.uuids import uuid7  # noqa: E402
+
+BATCH = 1000
+KEYS = (
+    ('uuid4', '"uuid" char(32) NOT NULL PRIMARY KEY', lambda: uuid.uuid4().hex),
+    ('uuid7', '"uuid" char(32) NOT NULL PRIMARY KEY', lambda: uuid7().hex),
+    ('bigauto', '"id" integer NOT NULL PRIMARY KEY AUTOINCREMENT', None),
+)
+
+
+def index_size(connection):
+    try:
+        return connection.execute(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name LIKE 'sqlite_autoindex_%' OR name = 'item'"
+        ).fetchone()[0]
+    except sqlite3.OperationalError:
+        page_size = connection.execute('PRAGMA page_size').fetchone()[0]
+        return connection.execute('PRAGMA page_count').fetchone()[0] * page_size
+
+
+def run(rows, label, column, make_key):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'benchmark.sqlite3')
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA cache_size = -2000')
+    connection.execute('CREATE TABLE "item" (%s, "title" varchar(50) NOT NULL)' % column)
+    if make_key is None:
+        query = 'INSERT INTO "item" ("title") VALUES (?)'
+        batch = lambda: [('title %d' % index,) for index in range(BATCH)]
+    else:
+        query = 'INSERT INTO "item" VALUES (?, ?)'
+        batch = lambda: [(make_key(), 'title %d' % index) for index in range(BATCH)]
+    start = time.time()
+    for _ in range(rows // BATCH):
+        connection.executemany(query, batch())
+        connection.commit()
+    elapsed = time.time() - start
+    size = index_size(connection)
+    connection.close()
+    os.remove(path)
+    os.rmdir(directory)
+    print('%-10s %12.0f rows/s %12.1f MiB' % (label, rows / elapsed, size / 1048576.0))
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    print('%-10s %19s %16s' % ('key', 'insert', 'table + index'))
+    for label, column, make_key in KEYS:
+        run(rows, label, column, make_key)
+
+
+if __name__ == '__main__':
+    main()
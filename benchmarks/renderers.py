@@ -0,0 +1,49 @@
+"""
+Compare render and parse throughput of DRF's JSON renderer and parser with the fast JSON and MessagePack ones.
+
+Rows look like the output of a generated serializer.
+
+    python benchmarks/renderers.py [rows]
+"""
+import io
+import sys
+
+from common import report, setup
+
+setup()
+
+from rest_framework import parsers as drf_parsers, renderers as drf_renderers  # noqa: E402
+
+from django_rest_generators import parsers, renderers  # noqa: E402
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    data = [
+        {
+            'uuid': '%032x' % index,
+            'name': 'Name %d' % index,
+            'description': 'A longer description of the row number %d' % index,
+            'count': index,
+            'ratio': index / 7.0,
+            'active': bool(index % 2),
+            'created': '2017-06-16T12:21:03.123456Z',
+            'author': None if index % 3 else '%032x' % (index // 3)
+        } for index in range(rows)
+    ]
+    formats = [
+        ('DRF JSON', drf_renderers.JSONRenderer(), drf_parsers.JSONParser()),
+        ('fast JSON' if renderers.orjson else 'fast JSON (orjson missing)', renderers.JSONRenderer(),
+         parsers.JSONParser()),
+    ]
+    if renderers.msgpack is not None:
+        formats.append(('MessagePack', renderers.MessagePackRenderer(), parsers.MessagePackParser()))
+    for label, renderer, parser in formats:
+        content = renderer.render(data)
+        report('render, %s' % label, lambda: renderer.render(data), rows)
+        report('parse, %s' % label, lambda: parser.parse(io.BytesIO(content)), rows)
+        print('%-50s %10d bytes' % ('size, %s' % label, len(content)))
+
+
+if __name__ == '__main__':
+    main()
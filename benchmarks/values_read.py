@@ -0,0 +1,103 @@
+"""
+Compare list and retrieve throughput of a generated viewset with and without the values() read path.
+
+Whole requests are timed, from the database query to the rendered JSON.
+
+    python benchmarks/values_read.py [rows]
+"""
+import sys
+
+from common import report, setup
+
+setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework import permissions, serializers, viewsets  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from django_rest_generators import mixins  # noqa: E402
+
+
+class Detail(serializers.ModelSerializer):
+    id = serializers.IntegerField(read_only=True, required=False, allow_null=False)
+    username = serializers.CharField(max_length=150, read_only=False, required=True, allow_null=False)
+    first_name = serializers.CharField(max_length=150, read_only=False, required=False, allow_null=False)
+    last_name = serializers.CharField(max_length=150, read_only=False, required=False, allow_null=False)
+    email = serializers.EmailField(read_only=False, required=False, allow_null=False)
+    is_staff = serializers.BooleanField(read_only=False, required=False, allow_null=False)
+    is_active = serializers.BooleanField(read_only=False, required=False, allow_null=False)
+    date_joined = serializers.DateTimeField(read_only=False, required=False, allow_null=False)
+    last_login = serializers.DateTimeField(read_only=False, required=False, allow_null=True)
+
+    class Meta(object):
+        model = User
+        fields = (
+            'id',
+            'username',
+            'first_name',
+            'last_name',
+            'email',
+            'is_staff',
+            'is_active',
+            'date_joined',
+            'last_login'
+        )
+
+
+class Regular(viewsets.ModelViewSet):
+    serializer_class = Detail
+    queryset = User.objects.order_by('id')
+    permission_classes = [
+        permissions.AllowAny
+    ]
+
+
+class Values(mixins.ValuesMixin, Regular):
+    pass
+
+
+def request(view, path, **kwargs):
+    response = view(APIRequestFactory().get(path), **kwargs)
+    response.render()
+    return response.content
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    now = timezone.now()
+    User.objects.bulk_create([
+        User(
+            username='user%d' % index,
+            first_name='First',
+            last_name='Last',
+            email='user%d@example.com' % index,
+            date_joined=now,
+            last_login=now if index % 2 else None
+        ) for index in range(rows)
+    ])
+    regular_list = Regular.as_view({'get': 'list'})
+    values_list = Values.as_view({'get': 'list'})
+    assert request(regular_list, '/') == request(values_list, '/')
+    regular = report('list, model instances', lambda: request(regular_list, '/'), rows)
+    values = report('list, values()', lambda: request(values_list, '/'), rows)
+    print('%-50s %10.2fx' % ('speedup, list', regular / values))
+
+    regular_detail = Regular.as_view({'get': 'retrieve'})
+    values_detail = Values.as_view({'get': 'retrieve'})
+    assert request(regular_detail, '/1/', pk='1') == request(values_detail, '/1/', pk='1')
+    regular = report(
+        'retrieve, model instance',
+        lambda: [request(regular_detail, '/1/', pk='1') for _ in range(1000)],
+        1000
+    )
+    values = report(
+        'retrieve, values()',
+        lambda: [request(values_detail, '/1/', pk='1') for _ in range(1000)],
+        1000
+    )
+    print('%-50s %10.2fx' % ('speedup, retrieve', regular / values))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import random
+from asgiref.local import Local
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_state = Local()
+
+
+def get_primary_database():
+    return getattr(settings, 'DRG_PRIMARY_DATABASE', DEFAULT_DB_ALIAS)
+
+
+def get_replica_databases():
+    return list(getattr(settings, 'DRG_REPLICA_DATABASES', ()))
+
+
+def start_request(replica):
+    """Start routing the queries of a request, reading from one of the replicas if ``replica`` is set."""
+    replicas = get_replica_databases()
+    _state.replica = random.choice(replicas) if replica and replicas else None
+    _state.written = False
+
+
+def end_request():
+    """Stop routing the queries of the current request, and return whether it wrote to the database."""
+    written = getattr(_state, 'written', False)
+    _state.replica = None
+    _state.written = False
+    return written
+
+
+class ReplicaRouter(object):
+    """
+    Send writes to the primary database, and reads of safe requests (see ``mixins.ReplicaMixin``) to a replica.
+
+    Once a request has written, its following reads go to the primary too. Other reads are left to the next routers
+    (or to ``default``), so this router should be the last one of ``DATABASE_ROUTERS``.
+    """
+
+    def db_for_read(self, model, **hints):
+        replica = getattr(_state, 'replica', None)
+        if replica is None:
+            return None
+        if _state.written:
+            return get_primary_database()
+        return replica
+
+    def db_for_write(self, model, **hints):
+        _state.written = True
+        return get_primary_database()
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = [get_primary_database()] + get_replica_databases()
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
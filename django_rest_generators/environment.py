@@ -0,0 +1,176 @@
+"""
+Ready-made behave hooks for DRG steps. Import them in your ``features/environment.py``, once Django is set up :
+
+    from django_rest_generators.environment import before_all, after_all, before_scenario, after_scenario
+
+The whole run happens in one transaction per database, and each scenario is rolled back to a savepoint. Steps decorated
+with ``fixture`` are only executed once per run : the next times, the objects they created are inserted again in one
+query per model.
+"""
+import functools
+import itertools
+from contextlib import ExitStack
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models.signals import post_save, pre_save
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+# Set by the drg_behave command, which sets the test environment and databases up itself
+managed = False
+
+# Statements a fixture may execute to be cached : anything else may depend on the content of the database
+FIXTURE_STATEMENTS = ('INSERT', 'SAVEPOINT', 'RELEASE')
+
+
+def _databases():
+    return [alias for alias in connections if not connections[alias].settings_dict['TEST'].get('MIRROR')]
+
+
+def _enter_atomics():
+    atomics = []
+    for alias in _databases():
+        atomic = transaction.atomic(using=alias)
+        atomic.__enter__()
+        atomics.append(atomic)
+    return atomics
+
+
+def _rollback_atomics(atomics):
+    for atomic in reversed(atomics):
+        transaction.set_rollback(True, using=atomic.using)
+        atomic.__exit__(None, None, None)
+
+
+def before_all(context):
+    if not managed:
+        context.test_runner = DiscoverRunner()
+        context.test_runner.setup_test_environment()
+        context.old_db_config = context.test_runner.setup_databases()
+    context.apiClient = APIClient()
+    context.apiFixtures = {}
+    context.apiAtomics = _enter_atomics()
+
+
+def after_all(context):
+    _rollback_atomics(context.apiAtomics)
+    if not managed:
+        context.test_runner.teardown_databases(context.old_db_config)
+        context.test_runner.teardown_test_environment()
+
+
+def before_scenario(context, _):
+    cache.clear()
+    context.apiScenarioAtomics = _enter_atomics()
+
+
+def after_scenario(context, _):
+    _rollback_atomics(context.apiScenarioAtomics)
+    context.apiClient.logout()
+    del context.apiScenarioAtomics
+
+
+def _capture(step, context, args, kwargs):
+    """
+    Execute a step, and return the objects it created, or None if they can not be restored by inserting them. Each
+    object is a ``(model, using, values, key)`` tuple, ``key`` being its auto-generated key, if any.
+    """
+    objects = []
+    generated = set()
+
+    def before(sender, instance, **kwargs):
+        auto = instance._meta.auto_field
+        if auto is not None and getattr(instance, auto.attname) is None:
+            generated.add(id(instance))
+
+    def receiver(sender, instance, **kwargs):
+        key = instance.pk if id(instance) in generated else None
+        generated.discard(id(instance))
+        if kwargs.get('created') and not kwargs.get('raw'):
+            # bulk_create does not handle multi-table inheritance
+            objects.append((type(instance), kwargs.get('using'), None if instance._meta.parents else {
+                field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields
+            }, key))
+
+    with ExitStack() as stack:
+        queries = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in _databases()]
+        pre_save.connect(before, weak=False)
+        post_save.connect(receiver, weak=False)
+        try:
+            step(context, *args, **kwargs)
+        finally:
+            pre_save.disconnect(before)
+            post_save.disconnect(receiver)
+    statements = [query['sql'].lstrip().upper() for captured in queries for query in captured]
+    if not all(statement.startswith(FIXTURE_STATEMENTS) for statement in statements) or \
+            any(values is None for _, _, values, _ in objects):
+        return None
+    # Objects inserted without save() (bulk_create, many-to-many relations) would not be restored
+    if len([statement for statement in statements if statement.startswith('INSERT')]) != len(objects):
+        return None
+    return objects
+
+
+def _remap(model, values, keys):
+    """Return ``values`` with the foreign keys pointing to restored rows replaced by the keys those rows got."""
+    values = dict(values)
+    for field in model._meta.concrete_fields:
+        if field.is_relation and field.target_field.primary_key:
+            key = (field.target_field.model._meta.concrete_model, values[field.attname])
+            values[field.attname] = keys.get(key, values[field.attname])
+    return values
+
+
+def _restore(objects):
+    # Auto-generated keys are not inserted again : once rolled back, the database may give them to other rows
+    keys = {}
+    for (model, using), group in itertools.groupby(objects, key=lambda obj: obj[:2]):
+        group = list(group)
+        manager = model._base_manager.using(using)
+        auto = model._meta.auto_field
+        instances = []
+        for _, _, values, key in group:
+            values = _remap(model, values, keys)
+            if key is not None:
+                del values[auto.attname]
+            instances.append(model(**values))
+        if connections[using].features.can_return_rows_from_bulk_insert or all(key is None for *_, key in group):
+            manager.bulk_create(instances)
+        else:
+            # The backend only returns the key of a single inserted row
+            fields = [field for field in model._meta.local_concrete_fields if field is not auto]
+            for instance in instances:
+                if instance.pk is not None:
+                    manager.bulk_create([instance])
+                    continue
+                returned = manager._insert([instance], fields, model._meta.db_returning_fields)
+                for value, field in zip(returned[0], model._meta.db_returning_fields):
+                    setattr(instance, field.attname, value)
+        concrete = model._meta.concrete_model
+        keys.update({(concrete, key): instance.pk for (*_, key), instance in zip(group, instances) if key is not None})
+
+
+def fixture(step):
+    """
+    Only execute a step once per run when the hooks of this module are used. The next times, the objects it created are
+    inserted again with one ``bulk_create`` per model, without calling ``save()`` or sending signals. Auto-generated
+    keys are generated again, and the foreign keys between restored objects follow them.
+
+    Steps reading or updating the database, or creating objects without ``save()``, are always executed.
+    """
+
+    @functools.wraps(step)
+    def wrapper(context, *args, **kwargs):
+        fixtures = getattr(context, 'apiFixtures', None)
+        if fixtures is None:
+            return step(context, *args, **kwargs)
+        key = (step.__module__, step.__qualname__, args, tuple(sorted(kwargs.items())))
+        if key not in fixtures:
+            fixtures[key] = _capture(step, context, args, kwargs)
+        elif fixtures[key] is None:
+            step(context, *args, **kwargs)
+        else:
+            _restore(fixtures[key])
+
+    return wrapper
@@ -0,0 +1,66 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from guardian.shortcuts import get_objects_for_user
+from rest_framework import filters, permissions, serializers
+from rest_framework.exceptions import ValidationError
+
+
+class ObjectPermissionsFilter(filters.BaseFilterBackend):
+    perm_format = '%(app_label)s.view_%(model_name)s'
+
+    def filter_queryset(self, request, queryset, view):
+        if request.method not in permissions.SAFE_METHODS or getattr(view, 'detail', False):
+            return queryset
+        meta = queryset.model._meta
+        return get_objects_for_user(
+            request.user,
+            self.perm_format % {
+                'app_label': meta.app_label,
+                'model_name': meta.model_name
+            },
+            queryset,
+            accept_global_perms=False
+        )
+
+
+class FieldFilter(filters.BaseFilterBackend):
+    """
+    Filter the queryset from query parameters, using the lookups allowed by the view's ``filter_lookups``.
+
+    ``filter_lookups`` maps field names to the lookups clients may use (``exact``, ``gte``, ``lte``,
+    ``startswith``) : ``?count=3``, ``?count__gte=3``, ``?name__startswith=Fir``. Other query parameters are ignored.
+    Boolean fields accept the values of DRF's ``BooleanField`` (``?active=true``).
+    """
+
+    @staticmethod
+    def _convert(field, value):
+        if isinstance(field, models.BooleanField):
+            # The model field only accepts True, t, 1, False, f and 0
+            return serializers.BooleanField().to_internal_value(value)
+        return field.to_python(value)
+
+    def filter_queryset(self, request, queryset, view):
+        filters_ = {}
+        errors = {}
+        for name, lookups in getattr(view, 'filter_lookups', {}).items():
+            field = queryset.model._meta.get_field(name)
+            for lookup in lookups:
+                param = name if lookup == 'exact' else '%s__%s' % (name, lookup)
+                if param not in request.query_params:
+                    continue
+                try:
+                    filters_[param] = self._convert(field, request.query_params[param])
+                except DjangoValidationError as error:
+                    errors[param] = error.messages
+                except ValidationError as error:
+                    errors[param] = error.detail
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**filters_)
+
+
+class OrderingFilter(filters.OrderingFilter):
+    """Ordering filter restricted to the view's ``ordering_fields``."""
+
+    def get_valid_fields(self, queryset, view, context=None):
+        return [(field, field) for field in getattr(view, 'ordering_fields', ())]
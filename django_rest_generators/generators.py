@@ -1,6 +1,10 @@
 import hashlib
+import ipaddress
 import uuid
 import datetime
+from django.conf import settings
+from django.db.backends.base.operations import BaseDatabaseOperations
+from django.utils import timezone
 
 
 def boolean_generator(origin):
@@ -27,6 +31,14 @@ def uuid_generator(origin):
     return uuid.UUID(hashlib.md5(origin.encode("utf-8")).hexdigest()).hex
 
 
+def uuid7_generator(origin):
+    digest = int(hashlib.md5(origin.encode("utf-8")).hexdigest(), 16)
+    timestamp = 1483228800000 + len(origin)
+    return uuid.UUID(
+        int=(timestamp << 80) | (0x7 << 76) | (((digest >> 64) & 0xfff) << 64) | (0x2 << 62) | (digest & 0x3fffffffffffffff)
+    ).hex
+
+
 def ip_generator(origin):
     return "{0}.{0}.{0}.{0}".format(len(origin))
 
@@ -35,6 +47,10 @@ def integer_generator(origin):
     return len(origin)
 
 
+def auto_generator(origin):
+    return int(hashlib.md5(origin.encode("utf-8")).hexdigest()[:5], 16)
+
+
 def float_generator(origin):
     origin = len(origin)
     return origin + (origin / 10.0)
@@ -50,3 +66,109 @@ def date_generator(origin):
     return "%sZ" % base_time.isoformat()
 
 
+# Batch generators, used to seed tables : each one returns ``count`` values for the rows ``start`` to
+# ``start + count - 1``. Random values are drawn from ``rng`` (a ``random.Random``) row after row, so that the same seed
+# gives the same rows whatever the batch size ; unique values are derived from the row index.
+
+WORDS = (
+    'alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel',
+    'india', 'juliett', 'kilo', 'lima', 'mike', 'november', 'oscar', 'papa',
+    'quebec', 'romeo', 'sierra', 'tango', 'uniform', 'victor', 'whiskey', 'yankee'
+)
+BASE_DATE = datetime.date(2017, 1, 1)
+SPAN_DAYS = 3 * 365
+
+
+def _truncate(field, values, unique, start, count):
+    max_length = field.max_length
+    if max_length is None:
+        return values
+    if unique and len('%d ' % (start + count - 1)) > max_length:
+        raise ValueError('%s is too short to hold %d unique values' % (field.name, start + count))
+    return [value[:max_length] for value in values]
+
+
+def boolean_batch(field, rng, start, count, unique):
+    if unique:
+        raise ValueError('%s can not hold unique values' % field.name)
+    return [rng.random() < 0.5 for _ in range(count)]
+
+
+def text_batch(field, rng, start, count, unique):
+    values = [' '.join([rng.choice(WORDS), rng.choice(WORDS), rng.choice(WORDS)]) for _ in range(count)]
+    if unique:
+        values = ['%d %s' % (start + index, value) for index, value in enumerate(values)]
+    return _truncate(field, values, unique, start, count)
+
+
+def email_batch(field, rng, start, count, unique):
+    if unique:
+        values = ['user%d@example.com' % (start + index) for index in range(count)]
+    else:
+        values = ['%s@example.com' % rng.choice(WORDS) for _ in range(count)]
+    return _truncate(field, values, unique, start, count)
+
+
+def slug_batch(field, rng, start, count, unique):
+    values = ['%s-%s' % (rng.choice(WORDS), rng.choice(WORDS)) for _ in range(count)]
+    if unique:
+        values = ['%d-%s' % (start + index, value) for index, value in enumerate(values)]
+    return _truncate(field, values, unique, start, count)
+
+
+def url_batch(field, rng, start, count, unique):
+    if unique:
+        values = ['http://example.com/%d/' % (start + index) for index in range(count)]
+    else:
+        values = ['http://%s.com/' % rng.choice(WORDS) for _ in range(count)]
+    return _truncate(field, values, unique, start, count)
+
+
+def uuid_batch(field, rng, start, count, unique):
+    if unique:
+        # Random UUIDs would repeat the ones of the first rows when the same seed is used again
+        return [uuid.UUID(int=start + index, version=4) for index in range(count)]
+    return [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(count)]
+
+
+def ip_batch(field, rng, start, count, unique):
+    if unique:
+        if start + count > 1 << 24:
+            raise ValueError('%s can not hold %d unique values' % (field.name, start + count))
+        return [str(ipaddress.IPv4Address((10 << 24) + start + index)) for index in range(count)]
+    return [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(count)]
+
+
+def integer_batch(field, rng, start, count, unique):
+    # Ranges every backend can hold (SQLite does not enforce any)
+    low, high = BaseDatabaseOperations.integer_field_ranges.get(field.get_internal_type(), (0, (1 << 31) - 1))
+    low = max(low, 0)
+    if unique:
+        if low + start + count - 1 > high:
+            raise ValueError('%s can not hold %d unique values' % (field.name, start + count))
+        return [low + start + index for index in range(count)]
+    high = min(high, low + 1000000)
+    return [rng.randint(low, high) for _ in range(count)]
+
+
+def float_batch(field, rng, start, count, unique):
+    if unique:
+        return [start + index + 0.5 for index in range(count)]
+    return [round(rng.uniform(0, 1000), 2) for _ in range(count)]
+
+
+def datetime_batch(field, rng, start, count, unique):
+    base = datetime.datetime.combine(BASE_DATE, datetime.time())
+    if settings.USE_TZ:
+        base = timezone.make_aware(base, timezone.utc)
+    if unique:
+        return [base + datetime.timedelta(seconds=start + index) for index in range(count)]
+    return [base + datetime.timedelta(seconds=rng.randrange(SPAN_DAYS * 86400)) for _ in range(count)]
+
+
+def date_batch(field, rng, start, count, unique):
+    if unique:
+        if (datetime.date.max - BASE_DATE).days < start + count:
+            raise ValueError('%s can not hold %d unique values' % (field.name, start + count))
+        return [BASE_DATE + datetime.timedelta(days=start + index) for index in range(count)]
+    return [BASE_DATE + datetime.timedelta(days=rng.randrange(SPAN_DAYS)) for _ in range(count)]
@@ -7,6 +7,16 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('app', help='Target application name')
         parser.add_argument('name', help='Target model name')
+        parser.add_argument(
+            '--pk',
+            default='uuid4',
+            help='Primary key of the model',
+            choices=[
+                'uuid4',
+                'uuid7',
+                'bigauto',
+            ]
+        )
 
     def handle(self, *args, **options):
         app = options['app']
@@ -19,20 +29,28 @@ class Command(BaseCommand):
         )
         if os.path.isfile(target_path):
             raise CommandError('Model %s already exists in %s' % (name, app,))
+        if options['pk'] == 'bigauto':
+            pk_import = ''
+            pk_field = 'id = models.BigAutoField(primary_key=True)'
+        elif options['pk'] == 'uuid7':
+            pk_import = 'from django_rest_generators.uuids import uuid7\n'
+            pk_field = 'uuid = models.UUIDField(primary_key=True, editable=False, default=uuid7)'
+        else:
+            pk_import = 'from uuid import uuid4\n'
+            pk_field = 'uuid = models.UUIDField(primary_key=True, editable=False, default=uuid4)'
         with open(target_path, 'w+') as file:
-            file.write("""from uuid import uuid4
-from django.db import models
+            file.write("""%sfrom django.db import models
 
 
 class %s(models.Model):
-    uuid = models.UUIDField(primary_key=True, editable=False, default=uuid4)
+    %s
     
     class Meta(object):
         permissions = (
             ('view_%s', 'View %s',),
         )
         default_related_name = '%ss'
-""" % (name.capitalize(), name, name, name))
+""" % (pk_import, name.capitalize(), pk_field, name, name, name))
         init_path = os.path.join(
             settings.BASE_DIR,
             app,
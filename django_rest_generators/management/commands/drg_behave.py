@@ -0,0 +1,201 @@
+import heapq
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from multiprocessing.connection import wait
+from django.core.management import BaseCommand, CommandError
+from django.db import connections
+from django.test.runner import DiscoverRunner
+from django_rest_generators import environment
+
+
+def _init_worker(worker_id):
+    """Switch to the databases cloned for this worker, as Django's parallel test runner does."""
+    for alias in connections:
+        connection = connections[alias]
+        if hasattr(connection.creation, 'setup_worker_connection'):
+            connection.creation.setup_worker_connection(worker_id)
+            continue
+        # connection.settings_dict must be updated in place, see django.test.runner._init_worker
+        connection.settings_dict.update(connection.creation.get_test_db_clone_settings(str(worker_id)))
+        connection.close()
+
+
+def _run_shard(worker_id, paths, args, report, cloned):
+    from behave.__main__ import main
+    if cloned:
+        _init_worker(worker_id)
+    sys.exit(main(list(paths) + list(args) + ['--format', 'json', '--outfile', report, '--no-summary']))
+
+
+class Command(BaseCommand):
+    help = 'Run behave features, sharded across worker processes with their own test databases'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=['features'], help='Feature files or directories')
+        parser.add_argument(
+            '--parallel',
+            type=int,
+            default=1,
+            help='Number of worker processes, 0 for one per CPU'
+        )
+        parser.add_argument(
+            '--tags',
+            action='append',
+            default=[],
+            help='Only run the scenarios matching this behave tag expression, can be repeated'
+        )
+        parser.add_argument(
+            '--durations',
+            default='.drg_behave_durations.json',
+            help='File keeping the duration of each feature, used to balance the workers'
+        )
+        parser.add_argument('--report', help='Write the merged behave JSON report to this file')
+
+    def handle(self, *args, **options):
+        features = self._features(options['paths'])
+        if not features:
+            raise CommandError('No feature file found in %s' % ', '.join(options['paths']))
+        parallel = options['parallel'] or multiprocessing.cpu_count()
+        parallel = max(min(parallel, len(features)), 1)
+        durations = self._load_durations(options['durations'])
+        shards = self._shards(features, durations, parallel)
+        behave_args = ['--tags=%s' % tags for tags in options['tags']]
+
+        started = time.perf_counter()
+        environment.managed = True
+        runner = DiscoverRunner(parallel=parallel, verbosity=options['verbosity'])
+        runner.setup_test_environment()
+        old_config = runner.setup_databases()
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                features_reports, failures = self._run(shards, behave_args, directory, parallel > 1)
+            finally:
+                runner.teardown_databases(old_config)
+                runner.teardown_test_environment()
+
+        order = {feature: index for index, feature in enumerate(features)}
+        features_reports.sort(key=lambda feature: order.get(self._feature_path(feature), len(order)))
+        if options['report']:
+            with open(options['report'], 'w') as file:
+                json.dump(features_reports, file, indent=2)
+        durations.update({
+            self._feature_path(feature): self._duration(feature) for feature in features_reports
+        })
+        with open(options['durations'], 'w') as file:
+            json.dump(durations, file, indent=2, sort_keys=True)
+        if self._summary(features_reports, time.perf_counter() - started) or failures:
+            sys.exit(1)
+
+    @staticmethod
+    def _features(paths):
+        features = []
+        for path in paths:
+            if os.path.isdir(path):
+                for root, _, files in os.walk(path):
+                    features += [os.path.join(root, name) for name in sorted(files) if name.endswith('.feature')]
+            elif os.path.isfile(path):
+                features.append(path)
+            else:
+                raise CommandError('%s does not exist' % path)
+        return sorted(set(os.path.relpath(feature) for feature in features))
+
+    @staticmethod
+    def _load_durations(path):
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _shards(features, durations, parallel):
+        """Spread the features across the workers, longest first, each one going to the least busy worker."""
+        known = [durations[feature] for feature in features if feature in durations]
+        default = sum(known) / len(known) if known else 1.0
+        heap = [(0.0, index, []) for index in range(parallel)]
+        for feature in sorted(features, key=lambda feature: -durations.get(feature, default)):
+            total, index, shard = heapq.heappop(heap)
+            shard.append(feature)
+            heapq.heappush(heap, (total + durations.get(feature, default), index, shard))
+        return [sorted(shard) for _, _, shard in sorted(heap, key=lambda item: item[1]) if shard]
+
+    def _run(self, shards, behave_args, directory, cloned):
+        # Forking makes a copy of in-memory test databases, so workers must be forked
+        context = multiprocessing.get_context('fork')
+        # Forked workers must not share the connections of this process
+        connections.close_all()
+        started = time.perf_counter()
+        workers = {}
+        for index, shard in enumerate(shards):
+            report = os.path.join(directory, '%d.json' % (index + 1))
+            process = context.Process(target=_run_shard, args=(index + 1, shard, behave_args, report, cloned))
+            process.start()
+            workers[process.sentinel] = (index + 1, process, shard, report)
+        features_reports = []
+        failures = 0
+        while workers:
+            for sentinel in wait(list(workers)):
+                worker_id, process, shard, report = workers.pop(sentinel)
+                process.join()
+                self.stdout.write('Worker %d finished %d features in %.2fs' % (
+                    worker_id,
+                    len(shard),
+                    time.perf_counter() - started
+                ))
+                try:
+                    with open(report) as file:
+                        features_reports += json.load(file)
+                except (OSError, ValueError):
+                    self.stderr.write('Worker %d did not write any report (exit code %s)' % (
+                        worker_id,
+                        process.exitcode
+                    ))
+                    failures += 1
+        return features_reports, failures
+
+    @staticmethod
+    def _feature_path(feature):
+        return os.path.relpath(feature['location'].rsplit(':', 1)[0])
+
+    @staticmethod
+    def _duration(feature):
+        return sum(
+            step['result'].get('duration', 0)
+            for element in feature.get('elements', [])
+            for step in element.get('steps', [])
+            if 'result' in step
+        )
+
+    def _summary(self, features_reports, elapsed):
+        """Write a summary of the merged reports, and return the number of failed scenarios."""
+        features = Counter(feature['status'] for feature in features_reports)
+        elements = [element for feature in features_reports for element in feature.get('elements', [])
+                    if element['type'] != 'background']
+        scenarios = Counter(element['status'] for element in elements)
+        steps = Counter(
+            step['result']['status'] if 'result' in step else 'skipped'
+            for element in elements
+            for step in element.get('steps', [])
+        )
+        failing = [element for element in elements if element['status'] in ('failed', 'error')]
+        if failing:
+            self.stdout.write('\nFailing scenarios:')
+            for element in failing:
+                self.stdout.write('  %s  %s' % (element['location'], element['name']))
+        self.stdout.write('')
+        for name, counter in (('features', features), ('scenarios', scenarios), ('steps', steps)):
+            self.stdout.write('%d %s %s' % (
+                counter.pop('passed', 0),
+                name,
+                ', '.join(['passed'] + ['%d %s' % (count, status) for status, count in sorted(counter.items())])
+            ))
+        self.stdout.write('Took %.2fs (%.2fs of steps across workers)' % (
+            elapsed,
+            sum(self._duration(feature) for feature in features_reports)
+        ))
+        return len(failing)
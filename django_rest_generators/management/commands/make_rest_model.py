@@ -1,9 +1,18 @@
+import contextlib
+import hashlib
+import importlib
+import inspect
+import io
+import json
 import os
-from django.core.management import BaseCommand
+import sys
+import tempfile
+import time
+from django.core.management import BaseCommand, CommandError
 from django.db import models
 from django.apps import apps
 from django.conf import settings
-from django_rest_generators import generators
+from django_rest_generators import generators, uuids, watchers
 
 
 class Command(BaseCommand):
@@ -12,6 +21,40 @@ class Command(BaseCommand):
     model = None
     model_name = ''
     read_only = []
+    related_imports = []
+    pagination = 'none'
+    export = False
+    sparse_fields = False
+    bulk = False
+    conditional = False
+    cache = False
+    unique = 'validators'
+    unique_fields = []
+    unique_for = []
+    indexes = False
+    filters = False
+    list_serializer = False
+    fast_read = False
+    renderers = 'none'
+    replicas = False
+    budgets = False
+    latency_budget = None
+    check_only = False
+    manifest = None
+    generator_hash = None
+    manifest_name = '.drg-manifest.json'
+    signature_ignored_options = (
+        'verbosity',
+        'settings',
+        'pythonpath',
+        'traceback',
+        'no_color',
+        'force_color',
+        'skip_checks',
+        'name',
+        'all',
+        'check',
+    )
 
     mapper_generators = {
         models.BooleanField: generators.boolean_generator,
@@ -29,11 +72,19 @@ class Command(BaseCommand):
         models.PositiveSmallIntegerField: generators.integer_generator,
         models.FloatField: generators.float_generator,
         models.DateTimeField: generators.datetime_generator,
-        models.DateField: generators.date_generator
+        models.DateField: generators.date_generator,
+        models.AutoField: generators.auto_generator,
+        models.BigAutoField: generators.auto_generator
+    }
+
+    default_generators = {
+        uuids.uuid7: generators.uuid7_generator
     }
 
     def __init__(self):
         super(Command, self).__init__()
+        self.pending = {}
+        self.touched = []
         self.mapper_serializers = {
             models.BooleanField: lambda prop: self._generate_serialized(prop, "BooleanField"),
             models.NullBooleanField: lambda prop: self._generate_serialized(prop, "NullBooleanField"),
@@ -63,14 +114,151 @@ class Command(BaseCommand):
             models.FloatField: lambda prop: self._generate_serialized(prop, "FloatField"),
             models.DateTimeField: lambda prop: self._generate_serialized(prop, "DateTimeField"),
             models.DateField: lambda prop: self._generate_serialized(prop, "DateField"),
+            models.AutoField: lambda prop: self._generate_serialized(prop, "IntegerField"),
+            models.BigAutoField: lambda prop: self._generate_serialized(prop, "IntegerField"),
         }
 
+    @contextlib.contextmanager
+    def _open(self, path, mode, track=True):
+        file = io.StringIO()
+        if mode != 'w+':
+            file.write(self._read(path))
+            if mode == 'r+':
+                file.seek(0)
+        yield file
+        self.pending[path] = file.getvalue()
+        if track and path not in self.touched:
+            self.touched.append(path)
+
+    def _append_line(self, path, line, prefix=None):
+        with self._open(path, "r+") as file:
+            lines = file.getvalue().splitlines()
+            if line in lines:
+                return
+            replaced = [i for i, current in enumerate(lines) if prefix and current.startswith(prefix)]
+            if replaced:
+                lines[replaced[0]] = line
+            else:
+                lines.append(line)
+            file.seek(0)
+            file.truncate()
+            file.write("".join(["%s\n" % current for current in lines]))
+
+    def _read(self, path):
+        if path in self.pending:
+            return self.pending[path]
+        return self._read_disk(path)
+
+    @staticmethod
+    def _read_disk(path):
+        if not os.path.exists(path):
+            return ''
+        with open(path) as file:
+            return file.read()
+
+    @staticmethod
+    def _newline(path):
+        """Return the line ending of an existing file, so that rewriting it keeps it."""
+        if not os.path.exists(path):
+            return None
+        with open(path, newline='') as file:
+            line = file.readline()
+        return line[len(line.rstrip('\r\n')):] or None
+
+    def _flush(self):
+        umask = os.umask(0)
+        os.umask(umask)
+        changed = [
+            (path, content) for path, content in sorted(self.pending.items())
+            if content != self._read_disk(path)
+        ]
+        if self.check_only:
+            self.pending = {}
+            return [path for path, _ in changed]
+        for path, content in changed:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handle, temp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.drg-')
+            with os.fdopen(handle, 'w', newline=self._newline(path)) as file:
+                file.write(content)
+            os.chmod(temp, os.stat(path).st_mode if os.path.exists(path) else 0o666 & ~umask)
+            os.replace(temp, path)
+        self.pending = {}
+        return [path for path, _ in changed]
+
+    @staticmethod
+    def _hash(content):
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _stable(value):
+        if isinstance(value, (list, tuple)):
+            return [Command._stable(element) for element in value]
+        if isinstance(value, dict):
+            return sorted((key, Command._stable(element)) for key, element in value.items())
+        if hasattr(value, 'deconstruct') and not isinstance(value, type):
+            return Command._stable(value.deconstruct())
+        if callable(value):
+            return '%s.%s' % (getattr(value, '__module__', ''), getattr(value, '__qualname__', value))
+        return repr(value)
+
+    def _signature(self, options):
+        fields = []
+        for field in self.model._meta.get_fields():
+            if hasattr(field, 'deconstruct'):
+                fields.append(Command._stable(field.deconstruct()))
+            else:
+                # Reverse relations, and generic foreign keys which have no related model
+                related = field.related_model
+                fields.append([
+                    field.name,
+                    field.__class__.__name__,
+                    related._meta.label if related is not None else None
+                ])
+        if Command.generator_hash is None:
+            with open(__file__.replace('.pyc', '.py')) as file:
+                Command.generator_hash = Command._hash(file.read())
+        return Command._hash(json.dumps([
+            Command.generator_hash,
+            fields,
+            Command._stable(self.model._meta.original_attrs),
+            Command._stable({
+                key: value for key, value in options.items()
+                if key not in self.signature_ignored_options
+            })
+        ]))
+
+    def _manifest_path(self):
+        return os.path.join(settings.BASE_DIR, self.manifest_name)
+
+    def _load_manifest(self):
+        content = self._read_disk(self._manifest_path())
+        if not content:
+            return {'models': {}, 'files': {}}
+        return json.loads(content)
+
+    def _is_up_to_date(self, key, signature):
+        entry = self.manifest['models'].get(key)
+        if entry is None or entry['signature'] != signature:
+            return False
+        return all(
+            self.manifest['files'].get(path) == Command._hash(
+                self._read(os.path.join(settings.BASE_DIR, path))
+            ) for path in entry['files']
+        )
+
     def _import_model(self, app, name):
         self.model = apps.get_model(app, name)
         self.model_name = self.model._meta.model_name.capitalize()
 
     def _date_validator(self, validator, prop_name, prop_date):
         self.include_validators = True
+        if self.unique == 'constraints':
+            self.unique_for.append("('%s', '%s', '%s')" % (
+                validator[len('UniqueFor'):].lower(),
+                prop_name,
+                prop_date
+            ))
+            return None
         return """
             validators.%sValidator(
                 queryset=models.%s.objects.all(),
@@ -84,34 +272,56 @@ class Command(BaseCommand):
             )
 
     def _validators(self, prop):
+        validator = None
         if prop.unique_for_month:
-            self.validators.append(self._date_validator(
+            validator = self._date_validator(
                 'UniqueForMonth',
                 prop.name,
                 prop.unique_for_month
-            ))
+            )
         elif prop.unique_for_year:
-            self.validators.append(self._date_validator(
+            validator = self._date_validator(
                 'UniqueForYear',
                 prop.name,
                 prop.unique_for_year
-            ))
+            )
         elif prop.unique_for_date:
-            self.validators.append(self._date_validator(
+            validator = self._date_validator(
                 'UniqueForDate',
                 prop.name,
                 prop.unique_for_date
-            ))
+            )
+        if validator is not None:
+            self.validators.append(validator)
+
+    def _combined_unique_validator(self):
+        return """
+            validators.CombinedUniqueValidator(
+                queryset=models.%s.objects.all(),
+                fields=[
+                    %s
+                ],
+                dates=[
+                    %s
+                ]
+            )""" % (
+            self.model_name,
+            ",\n                    ".join(["'%s'" % field for field in self.unique_fields]),
+            ",\n                    ".join(self.unique_for)
+        )
 
     def _common_props(self, prop):
-        if not prop.editable:
+        editable = prop.editable and not isinstance(prop, models.AutoField)
+        if not editable:
             self.read_only.append(prop.name)
         basics = [
-            "read_only=%s" % ("False" if prop.editable else "True"),
-            "required=%s" % ("False" if prop.blank or not prop.editable else "True"),
+            "read_only=%s" % ("False" if editable else "True"),
+            "required=%s" % ("False" if prop.blank or not editable else "True"),
             "allow_null=%s" % ("True" if prop.null else "False")
         ]
-        if prop.unique:
+        if prop.unique and editable and self.unique == 'constraints':
+            self.unique_fields.append(prop.name)
+        if prop.unique and self.unique == 'validators':
             self.include_validators = True
             basics.append("""validators=[
             validators.UniqueValidator(
@@ -132,16 +342,81 @@ class Command(BaseCommand):
             ",\n        ".join(args)
         )
 
-    def _map_properties(self):
+    def _related_queryset(self, app, prop):
+        related = prop.related_model._meta
+        if related.app_label == app:
+            return "models.%s.objects.all()" % related.object_name
+        module = "%s_models" % related.app_label
+        import_line = "from %s import models as %s" % (
+            related.app_config.name,
+            module
+        )
+        if import_line not in self.related_imports:
+            self.related_imports.append(import_line)
+        return "%s.%s.objects.all()" % (module, related.object_name)
+
+    def _generate_related(self, app, prop, many=False):
+        args = ["many=True"] if many else []
+        if prop.editable:
+            args.append("queryset=%s" % self._related_queryset(app, prop))
+        return self._generate_serialized(prop, "PrimaryKeyRelatedField", args)
+
+    @staticmethod
+    def _generate_reverse_related(prop, many=False):
+        return """%s = serializers.PrimaryKeyRelatedField(
+        %sread_only=True
+    )""" % (
+            prop.get_accessor_name(),
+            "many=True,\n        " if many else ""
+        )
+
+    def _map_relation(self, app, prop, mapped, nested):
+        if isinstance(prop, (models.ForeignKey, models.OneToOneField)):
+            name = prop.name
+            mapped['select_related'].append(name)
+            serialized = lambda: self._generate_related(app, prop)
+        elif isinstance(prop, models.ManyToManyField):
+            name = prop.name
+            mapped['prefetch_related'].append(name)
+            serialized = lambda: self._generate_related(app, prop, True)
+        elif isinstance(prop, models.OneToOneRel):
+            name = prop.get_accessor_name()
+            mapped['select_related'].append(name)
+            serialized = lambda: Command._generate_reverse_related(prop)
+        elif isinstance(prop, (models.ManyToOneRel, models.ManyToManyRel)):
+            name = prop.get_accessor_name()
+            mapped['prefetch_related'].append(name)
+            serialized = lambda: Command._generate_reverse_related(prop, True)
+        else:
+            return
+        mapped['relations'].append(name)
+        label = prop.related_model._meta.label_lower
+        if label not in mapped['related_models']:
+            mapped['related_models'].append(label)
+        if not nested:
+            mapped['serialized'].append(serialized())
+
+    def _map_properties(self, app, relations='pk'):
         mapped = {
             'serialized': [],
             'fields': [],
+            'relations': [],
+            'related_models': [],
+            'select_related': [],
+            'prefetch_related': [],
             'test_generators': {},
             'test_required': [],
-            'lookup_field': ''
+            'lookup_field': '',
+            'created_field': '',
+            'version_field': '',
+            'ordering': '',
+            'nested': relations == 'nested'
         }
         for prop in self.model._meta.get_fields():
-            if type(prop) in self.mapper_serializers:
+            if prop.is_relation:
+                if relations != 'none':
+                    self._map_relation(app, prop, mapped, relations == 'nested')
+            elif type(prop) in self.mapper_serializers:
                 mapped['fields'].append(prop.name)
                 self._validators(prop)
                 mapped['serialized'].append(
@@ -149,12 +424,162 @@ class Command(BaseCommand):
                 )
                 mapped['test_generators'][prop.name] = \
                     self.mapper_generators[type(prop)]
+                if callable(prop.default) and prop.default in self.default_generators:
+                    mapped['test_generators'][prop.name] = self.default_generators[prop.default]
                 if prop.primary_key:
                     mapped['lookup_field'] = prop.name
-                if not prop.blank:
+                if not prop.blank or prop.primary_key:
                     mapped['test_required'].append(prop.name)
+                if isinstance(prop, models.DateTimeField) and prop.auto_now_add \
+                        and (prop.db_index or prop.unique) and not mapped['created_field']:
+                    mapped['created_field'] = prop.name
+                if not mapped['version_field'] and (
+                        (isinstance(prop, models.DateTimeField) and prop.auto_now) or
+                        (isinstance(prop, models.IntegerField) and prop.name == 'version')):
+                    mapped['version_field'] = prop.name
+        if mapped['relations']:
+            # Related rows are serialized too, and changing them does not touch the version column
+            mapped['version_field'] = ''
+        mapped['ordering'] = mapped['created_field'] or mapped['lookup_field']
+        if self.unique_for:
+            self.validators.append(self._combined_unique_validator())
         return mapped
 
+    def _indexed_prefixes(self):
+        meta = self.model._meta
+        prefixes = set()
+        for field in meta.concrete_fields:
+            if field.primary_key or field.unique or field.db_index:
+                prefixes.add((field.name,))
+        groups = [list(fields) for fields in meta.unique_together]
+        groups += [list(fields) for fields in getattr(meta, 'index_together', ())]
+        groups += [
+            list(index.fields) for index in meta.indexes
+            if getattr(index, 'condition', None) is None
+        ]
+        groups += [
+            list(constraint.fields) for constraint in meta.constraints
+            if isinstance(constraint, models.UniqueConstraint) and constraint.condition is None
+        ]
+        for fields in groups:
+            fields = [field.lstrip('-') for field in fields]
+            for length in range(1, len(fields) + 1):
+                prefixes.add(tuple(fields[:length]))
+        return prefixes
+
+    def _queried_columns(self, mapped):
+        queried = [((mapped['lookup_field'],), 'lookup')]
+        if self.pagination != 'none':
+            queried.append(((mapped['ordering'],), 'ordering'))
+        for prop in self.model._meta.concrete_fields:
+            date_field = prop.unique_for_month or prop.unique_for_year or prop.unique_for_date
+            if date_field:
+                queried.append(((prop.name, date_field), 'unique_for'))
+        return queried
+
+    def _missing_indexes(self, mapped):
+        indexed = self._indexed_prefixes()
+        missing = []
+        for fields, reason in self._queried_columns(mapped):
+            if fields not in indexed and fields not in [element[0] for element in missing]:
+                missing.append((fields, reason))
+        return missing
+
+    def _index_name(self, fields):
+        name = '_'.join((self.model._meta.model_name,) + fields)
+        if len(name) > 26:
+            name = '%s_%s' % (name[:21], hashlib.md5(name.encode('utf-8')).hexdigest()[:4])
+        return '%s_idx' % name
+
+    def _generate_indexes(self, mapped):
+        missing = self._missing_indexes(mapped)
+        if not missing:
+            return
+        entries = [
+            "            models.Index(fields=[%s], name='%s'),  # %s" % (
+                ', '.join(["'%s'" % field for field in fields]),
+                self._index_name(fields),
+                reason
+            ) for fields, reason in missing
+        ]
+        path = inspect.getsourcefile(self.model)
+        lines = self._read(path).split('\n')
+        declaration = 'class %s(' % self.model.__name__
+        start = next((i for i, line in enumerate(lines) if line.startswith(declaration)), None)
+        if start is None:
+            self.stderr.write("Could not find %s in %s, add these indexes to its Meta :\n%s" % (
+                self.model.__name__,
+                path,
+                '\n'.join(entries)
+            ))
+            return
+        end = next((i for i in range(start + 1, len(lines)) if lines[i][:1] not in ('', ' ', '\t')), len(lines))
+        meta = next((i for i in range(start, end) if lines[i].startswith('    class Meta')), None)
+        if meta is None:
+            while not lines[end - 1].strip():
+                end -= 1
+            lines[end:end] = ['', '    class Meta(object):', '        indexes = ['] + entries + ['        ]']
+        else:
+            existing = next((
+                i for i in range(meta, end)
+                if lines[i].startswith('        indexes = ') and lines[i].rstrip().endswith('[')
+            ), None)
+            if existing is None:
+                lines[meta + 1:meta + 1] = ['        indexes = ['] + entries + ['        ]']
+            else:
+                lines[existing + 1:existing + 1] = entries
+        with self._open(path, "w+", False) as file:
+            file.write('\n'.join(lines))
+        if not self.check_only:
+            self.stdout.write("Added %d indexes to %s, run makemigrations to create them" % (
+                len(missing),
+                self.model._meta.label
+            ))
+
+    def _list_fields(self, mapped, fields):
+        single = [] if mapped['nested'] else [
+            name for name in mapped['relations']
+            if self.model._meta.get_field(name).concrete and not self.model._meta.get_field(name).many_to_many
+        ]
+        if fields is None:
+            return mapped['fields'] + single
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in mapped['fields'] + single]
+        if unknown:
+            raise CommandError("Can not use %s in the list serializer of %s" % (
+                ", ".join(unknown),
+                self.model._meta.label
+            ))
+        if mapped['lookup_field'] not in fields:
+            fields.insert(0, mapped['lookup_field'])
+        return fields
+
+    def _filter_lookups(self, mapped):
+        indexed = self._indexed_prefixes()
+        lookups = []
+        for name in mapped['fields']:
+            prop = self.model._meta.get_field(name)
+            if (name,) not in indexed:
+                continue
+            if isinstance(prop, models.BooleanField):
+                lookups.append((name, ('exact',)))
+            elif isinstance(prop, (models.IntegerField, models.FloatField, models.DateField)):
+                lookups.append((name, ('exact', 'gte', 'lte')))
+            elif isinstance(prop, models.CharField):
+                lookups.append((name, ('exact', 'startswith')))
+        return lookups
+
+    def _report_indexes(self, app, names, relations):
+        for name in names:
+            self._import_model(app, name)
+            self._reset_model_state()
+            for fields, reason in self._missing_indexes(self._map_properties(app, relations)):
+                self.stdout.write("%s: missing index on (%s) used for %s" % (
+                    self.model._meta.label,
+                    ', '.join(fields),
+                    reason
+                ))
+
     def _generate_serializer(self, app, name, mapped):
         path = os.path.join(
             settings.BASE_DIR,
@@ -162,86 +587,925 @@ class Command(BaseCommand):
             "serializers",
             "%s.py" % name
         )
-        init_path = os.path.join(
-            settings.BASE_DIR,
+        init_path = os.path.join(
+            settings.BASE_DIR,
+            app,
+            "serializers",
+            "__init__.py"
+        )
+        drg_modules = []
+        bases = []
+        if self.sparse_fields:
+            bases.append('mixins.SparseFieldsSerializerMixin')
+        if self.unique == 'constraints':
+            bases.append('mixins.UniqueConstraintSerializerMixin')
+        if bases:
+            drg_modules.append('mixins')
+        if self.list_serializer and 'mixins' not in drg_modules:
+            drg_modules.append('mixins')
+        if self.unique_for:
+            drg_modules.append('validators')
+        drg_import = ''
+        if drg_modules:
+            drg_import = 'from django_rest_generators import %s\n' % ', '.join(drg_modules)
+        summary = ''
+        if self.list_serializer:
+            summary = """
+
+class %sList(mixins.SummarySerializerMixin, serializers.BaseSerializer):
+    class Meta(object):
+        serializer = %s
+        fields = (
+            '%s'
+        )
+""" % (
+                name.capitalize(),
+                name.capitalize(),
+                "',\n            '".join(mapped['list_fields'])
+            )
+        with self._open(path, "w+") as file:
+            file.write("""%sfrom rest_framework import serializers%s
+from %s import models%s
+
+
+class %s(%sserializers.ModelSerializer):
+    %s
+    
+    class Meta(object):
+        lookup_field = '%s'
+        model = models.%s
+        fields = (
+            '%s'
+        )%s%s
+""" % (
+                drg_import,
+                ", validators" if self.include_validators and self.unique == 'validators' else '',
+                app,
+                "".join(["\n%s" % line for line in self.related_imports]),
+                name.capitalize(),
+                "".join(["%s, " % base for base in bases]),
+                "\n    ".join(mapped['serialized']),
+                mapped['lookup_field'],
+                name.capitalize(),
+                "',\n            '".join(mapped['fields'] + mapped['relations']),
+                "\n        depth = 1" if mapped['nested'] and mapped['relations'] else "",
+                "" if len(self.validators) == 0 else """
+        validators = [%s
+        ]""" % ",".join(self.validators)
+            ) + summary)
+        self._append_line(
+            init_path,
+            "from .%s import %s" % (name, ", ".join(
+                [name.capitalize()] + (["%sList" % name.capitalize()] if self.list_serializer else [])
+            )),
+            "from .%s import " % name
+        )
+
+    @staticmethod
+    def _generate_testing_values(mapped, key, show_all=True):
+        return ",\n        ".join([
+            "%s='%s'" % (
+                element,
+                mapped['test_generators'][element](key)
+            ) for element in mapped['fields']
+            if element in mapped['test_required'] or show_all
+        ])
+
+    def _generate_behavior_maker(self, app, name, mapped):
+        steps = os.path.join(settings.BASE_DIR, "features", "steps")
+        # The directories are created when the pending files are written
+        if not os.path.isdir(steps):
+            init = os.path.join(steps, "__init__.py")
+            with self._open(init, "w+") as file:
+                file.write("from django_rest_generators.steps"
+                           " import authentication, database, http\n")
+        path = os.path.join(steps, "%s.%s.py" % (app, name))
+        with self._open(path, "w+") as file:
+            file.write("""from behave import use_step_matcher, given
+from django_rest_generators.environment import fixture
+from {0}.models import {1}
+
+
+use_step_matcher('re')
+
+
+@given(r'a basic set of {2} exists in the database')
+@fixture
+def given_a_basic_set_of_{2}_exists(context):
+    {1}.objects.create(
+        {3}
+    )
+    {1}.objects.create(
+        {4}
+    )
+""".format(
+                app,
+                self.model_name,
+                name,
+                Command._generate_testing_values(mapped, "First"),
+                Command._generate_testing_values(mapped, "Second", False)
+            ))
+
+    def _list_order(self, mapped):
+        generator = mapped['test_generators'][mapped['ordering']]
+        if self.pagination != 'none' \
+                and mapped['ordering'] != mapped['created_field'] \
+                and generator('Second') < generator('First'):
+            return ['Second', 'First']
+        return ['First', 'Second']
+
+    def _generate_list_checks(self, mapped, line, key):
+        return "\n      ".join([
+            "And the returned %s %s have a key named %s with value %s" % (
+                "element" if self.pagination == 'none' else "page element",
+                line,
+                field,
+                mapped['test_generators'][field](key)
+            ) for field in mapped['fields']
+            if (key == 'First' or field in mapped['test_required']) and field in mapped['list_fields']
+        ])
+
+    def _generate_pagination_tests(self, app, name, mapped):
+        if self.pagination == 'none':
+            return ''
+        order = self._list_order(mapped)
+        lookup = mapped['lookup_field']
+        return """
+  Scenario: List {1}s page by page
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/
+      And i set the query parameter page_size to 1
+      And i send the request using GET
+    Then the return code is 200
+      And the returned page contain 1 elements
+      And the returned page element 0 have a key named {2} with value {3}
+    When i follow the next page link
+      And i send the request using GET
+    Then the return code is 200
+      And the returned page contain 1 elements
+      And the returned page element 0 have a key named {2} with value {4}
+      And there is no next page
+""".format(
+            app,
+            name,
+            lookup,
+            mapped['test_generators'][lookup](order[0]),
+            mapped['test_generators'][lookup](order[1])
+        )
+
+    def _generate_export_tests(self, app, name, mapped):
+        if not self.export:
+            return ''
+        order = self._list_order(mapped)
+        lookup = mapped['lookup_field']
+        return """
+  Scenario: Export {1}s as NDJSON
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/export/
+      And i send the request using GET
+    Then the return code is 200
+      And the returned stream contain 2 lines
+      And the returned stream line 0 have a key named {2} with value {3}
+      And the returned stream line 1 have a key named {2} with value {4}
+
+  Scenario: Export {1}s as CSV
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/export/
+      And i set the query parameter export_format to csv
+      And i send the request using GET
+    Then the return code is 200
+      And the returned stream contain 3 lines
+      And the returned stream line 0 is {5}
+
+  Scenario: Export {1}s with an invalid format
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+    When i prepare a request to /{0}/1.0/{1}/export/
+      And i set the query parameter export_format to invalid
+      And i send the request using GET
+    Then the return code is 400
+""".format(
+            app,
+            name,
+            lookup,
+            mapped['test_generators'][lookup](order[0]),
+            mapped['test_generators'][lookup](order[1]),
+            ",".join(mapped['fields'] + mapped['relations'])
+        )
+
+    def _generate_sparse_fields_tests(self, app, name, mapped):
+        if not self.sparse_fields:
+            return ''
+        lookup = mapped['lookup_field']
+        others = [field for field in mapped['fields'] if field != lookup]
+        return """
+  Scenario: Retrieve a {1} with sparse fields
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/{3}/
+      And i set the query parameter fields to {2}
+      And i send the request using GET
+    Then the return code is 200
+      And the return value for {2} is {3}
+      {4}
+
+  Scenario: Retrieve a {1} omitting fields
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/{3}/
+      And i set the query parameter omit to {5}
+      And i send the request using GET
+    Then the return code is 200
+      And the return value for {2} is {3}
+      {4}
+
+  Scenario: Retrieve a {1} with unknown sparse fields
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/{3}/
+      And i set the query parameter fields to {2},unknown_field
+      And i send the request using GET
+    Then the return code is 400
+""".format(
+            app,
+            name,
+            lookup,
+            mapped['test_generators'][lookup]('First'),
+            "\n      ".join([
+                "And there is no %s in the returned object" % field
+                for field in others + mapped['relations']
+            ]),
+            ",".join(others + mapped['relations'])
+        )
+
+    def _generate_bulk_tests(self, app, name, mapped):
+        if not self.bulk:
+            return ''
+        lookup = mapped['lookup_field']
+        editable = [field for field in mapped['fields'] if field not in self.read_only]
+        required = [field for field in editable if field in mapped['test_required']]
+
+        def elements(index, key, fields, pad=True):
+            return "\n      ".join([
+                "And i set %s to %s in element %s" % (
+                    field,
+                    mapped['test_generators'][field](key),
+                    index
+                ) for field in fields
+            ]) or ("And i add an empty element to the request" if pad else "")
+
+        def exists(key, negate=False):
+            return "\n      ".join([
+                "And %s %s.%s exists with %s %s" % (
+                    "no" if negate else "a",
+                    app,
+                    self.model_name,
+                    field,
+                    mapped['test_generators'][field](key)
+                ) for field in required
+            ])
+
+        tests = """
+  Scenario: Bulk create {1}s
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+    When i prepare a request to /{0}/1.0/{1}/
+      {2}
+      {3}
+      And i send the request using POST
+    Then the return code is 201
+      And the returned array contain 2 elements
+      And the returned element 0 have a key named {6} which is not null
+      And the returned element 1 have a key named {6} which is not null
+      {4}
+      {5}
+
+  Scenario: Bulk update {1}s
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/bulk/
+      And i set {6} to {7} in element 0
+      {9}
+      And i set {6} to {8} in element 1
+      And i send the request using PATCH
+    Then the return code is 200
+      And the returned array contain 2 elements
+      {10}
+
+  Scenario: Bulk update {1}s with an invalid {1}
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/bulk/
+      And i set {6} to {7} in element 0
+      {9}
+      And i set {6} to {11} in element 1
+      And i send the request using PATCH
+    Then the return code is 400
+      And the returned error for {6} is Unknown {6} "{11}".
+      {12}
+
+  Scenario: Bulk delete {1}s
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/bulk/
+      And i set {6} to {7} in element 0
+      And i set {6} to {8} in element 1
+      And i send the request using DELETE
+    Then the return code is 204
+      And no {0}.{13} exists with {6} {7}
+      And no {0}.{13} exists with {6} {8}
+
+  Scenario: Bulk delete {1}s with an invalid {1}
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/bulk/
+      And i set {6} to {7} in element 0
+      And i set {6} to {11} in element 1
+      And i send the request using DELETE
+    Then the return code is 400
+      And the returned error for {6} is Unknown {6} "{11}".
+      And a {0}.{13} exists with {6} {7}
+""".format(
+            app,
+            name,
+            elements(0, 'First', editable),
+            elements(1, 'Second', required),
+            exists('First'),
+            exists('Second'),
+            lookup,
+            mapped['test_generators'][lookup]('First'),
+            mapped['test_generators'][lookup]('Second'),
+            elements(0, 'Update', [field for field in editable if field != lookup], False),
+            exists('Update'),
+            mapped['test_generators'][lookup]('Third'),
+            exists('Update', True),
+            self.model_name
+        )
+        if required:
+            tests += """
+  Scenario: Bulk create {1}s with an invalid {1}
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+    When i prepare a request to /{0}/1.0/{1}/
+      {2}
+      And i add an empty element to the request
+      And i send the request using POST
+    Then the return code is 400
+      {3}
+""".format(
+                app,
+                name,
+                elements(0, 'First', editable),
+                exists('First', True)
+            )
+        return tests
+
+    def _generate_conditional_tests(self, app, name, mapped):
+        if not self.conditional:
+            return ''
+        lookup = mapped['lookup_field']
+        tests = """
+  Scenario: Retrieve an unchanged {1}
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i send the request using GET
+    Then the return code is 200
+      And i remember the returned etag
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i send the remembered etag
+      And i send the request using GET
+    Then the return code is 304
+
+  Scenario: List unchanged {1}s
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/
+      And i send the request using GET
+    Then the return code is 200
+      And i remember the returned etag
+    When i prepare a request to /{0}/1.0/{1}/
+      And i send the remembered etag
+      And i send the request using GET
+    Then the return code is 304
+""".format(
+            app,
+            name,
+            mapped['test_generators'][lookup]('First')
+        )
+        updated = [
+            field for field in mapped['fields']
+            if field not in self.read_only and field != lookup
+        ]
+        if updated:
+            tests += """
+  Scenario: Retrieve a modified {1}
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i send the request using GET
+    Then the return code is 200
+      And i remember the returned etag
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      {3}
+      And i send the request using PUT
+    Then the return code is 200
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i send the remembered etag
+      And i send the request using GET
+    Then the return code is 200
+""".format(
+                app,
+                name,
+                mapped['test_generators'][lookup]('First'),
+                "\n      ".join([
+                    "And i provide %s %s" % (
+                        field,
+                        mapped['test_generators'][field]('Update')
+                    ) for field in updated
+                ])
+            )
+        for label in self._seedable_children(mapped)[:1]:
+            tests += """
+  Scenario: List {1}s after related rows changed
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/
+      And i send the request using GET
+    Then the return code is 200
+      And i remember the returned etag
+    Given 3 {2} exist in the database
+    When i prepare a request to /{0}/1.0/{1}/
+      And i send the remembered etag
+      And i send the request using GET
+    Then the return code is 200
+""".format(app, name, label)
+        return tests
+
+    def _seedable_children(self, mapped):
+        """
+        Labels of the models pointing to this one through a reverse relation of the list payload, whose other required
+        foreign keys point to users or to this model : the ``exist in the database`` step can insert them in a scenario.
+        """
+        allowed = (self.model, apps.get_model(settings.AUTH_USER_MODEL))
+        labels = []
+        for relation in self.model._meta.related_objects:
+            if not relation.one_to_many or relation.get_accessor_name() not in mapped['list_fields']:
+                continue
+            required = [
+                field.related_model for field in relation.related_model._meta.concrete_fields
+                if field.is_relation and not field.null
+            ]
+            if all(model in allowed for model in required):
+                labels.append(relation.related_model._meta.label)
+        return labels
+
+    def _generate_cache_tests(self, app, name, mapped):
+        if not self.cache:
+            return ''
+        lookup = mapped['lookup_field']
+        updated = [
+            field for field in mapped['fields']
+            if field not in self.read_only and field != lookup
+        ]
+        tests = """
+  Scenario: List cached {1}s after a deletion
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/
+      And i send the request using GET
+    Then the return code is 200
+      And the returned {3} contain 2 elements
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i send the request using DELETE
+    Then the return code is 204
+    When i prepare a request to /{0}/1.0/{1}/
+      And i send the request using GET
+    Then the return code is 200
+      And the returned {3} contain 1 elements
+
+  Scenario: Retrieve a cached {1} after a deletion
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i send the request using GET
+    Then the return code is 200
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i send the request using DELETE
+    Then the return code is 204
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i send the request using GET
+    Then the return code is 404
+""".format(
+            app,
+            name,
+            mapped['test_generators'][lookup]('First'),
+            "array" if self.pagination == 'none' else "page"
+        )
+        if updated:
+            tests += """
+  Scenario: Retrieve a cached {1} after an update
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i send the request using GET
+    Then the return code is 200
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      {3}
+      And i send the request using PUT
+    Then the return code is 200
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i send the request using GET
+    Then the return code is 200
+      {4}
+""".format(
+                app,
+                name,
+                mapped['test_generators'][lookup]('First'),
+                "\n      ".join([
+                    "And i provide %s %s" % (
+                        field,
+                        mapped['test_generators'][field]('Update')
+                    ) for field in updated
+                ]),
+                "\n      ".join([
+                    "And the return value for %s is %s" % (
+                        field,
+                        mapped['test_generators'][field]('Update')
+                    ) for field in updated
+                ])
+            )
+        return tests
+
+    def _generate_unique_tests(self, app, name, mapped):
+        if self.unique != 'constraints':
+            return ''
+        editable = [field for field in mapped['fields'] if field not in self.read_only]
+        unique = [
+            field for field in editable
+            if self.model._meta.get_field(field).unique
+        ]
+        if not unique:
+            return ''
+        return """
+  Scenario: Create a duplicated {1}
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/
+      {2}
+      And i send the request using POST
+    Then the return code is 400
+      {3}
+""".format(
+            app,
+            name,
+            "\n      ".join([
+                "And i provide %s %s" % (
+                    field,
+                    mapped['test_generators'][field]('First')
+                ) for field in editable
+            ]),
+            "\n      ".join([
+                "And the returned error for %s is This field must be unique." % field
+                for field in unique
+            ])
+        )
+
+    def _generate_list_serializer_tests(self, app, name, mapped):
+        omitted = [
+            field for field in mapped['fields'] + mapped['relations']
+            if field not in mapped['list_fields']
+        ]
+        if not self.list_serializer or not omitted:
+            return ''
+        return """
+  Scenario: List {1}s with summary fields only
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/
+      And i send the request using GET
+    Then the return code is 200
+      {2}
+""".format(
+            app,
+            name,
+            "\n      ".join([
+                "And the returned %selement 0 have no key named %s" % (
+                    "" if self.pagination == 'none' else "page ",
+                    field
+                ) for field in omitted
+            ])
+        )
+
+    def _generate_renderers_tests(self, app, name, mapped):
+        if self.renderers != 'msgpack':
+            return ''
+        return """
+  Scenario: Create a {1} using MessagePack
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+    When i prepare a request to /{0}/1.0/{1}/
+      And i use the msgpack format
+      {3}
+      And i send the request using POST
+    Then the return code is 201
+      {4}
+
+  Scenario: Retrieve a {1} using MessagePack
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i use the msgpack format
+      And i send the request using GET
+    Then the return code is 200
+      {4}
+
+  Scenario: List {1}s using MessagePack
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/
+      And i use the msgpack format
+      And i send the request using GET
+    Then the return code is 200
+      And the returned {5} contain 2 elements
+""".format(
             app,
-            "serializers",
-            "__init__.py"
+            name,
+            mapped['test_generators'][mapped['lookup_field']]('First'),
+            "\n      ".join([
+                "And i provide %s %s" % (
+                    field,
+                    mapped['test_generators'][field]('First')
+                ) for field in mapped['fields']
+                if field not in self.read_only
+            ]),
+            "\n      ".join([
+                "And the return value for %s is %s" % (
+                    field,
+                    mapped['test_generators'][field]('First')
+                ) for field in mapped['fields']
+                if field != mapped['lookup_field']
+            ]),
+            "array" if self.pagination == 'none' else "page"
         )
-        with open(path, "w+") as file:
-            file.write("""from rest_framework import serializers%s
-from %s import models
 
+    def _generate_replicas_tests(self, app, name, mapped):
+        if not self.replicas:
+            return ''
+        return """
+  Scenario: List {1}s from a replica
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+      And the replicas lag behind the primary database
+      And the {0}.{2} objects are replicated
+    When i prepare a request to /{0}/1.0/{1}/
+      And i send the request using GET
+    Then the return code is 200
+      And the returned {4} contain 2 elements
+
+  Scenario: List {1}s from a replica lagging behind
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+      And the replicas lag behind the primary database
+    When i prepare a request to /{0}/1.0/{1}/
+      And i send the request using GET
+    Then the return code is 200
+      And the returned {4} contain 0 elements
 
-class %s(serializers.ModelSerializer):
-    %s
-    
-    class Meta(object):
-        lookup_field = '%s'
-        model = models.%s
-        fields = (
-            '%s'
-        )%s
-""" % (
-                ", validators" if self.include_validators else '',
-                app,
-                name.capitalize(),
-                "\n    ".join(mapped['serialized']),
-                mapped['lookup_field'],
-                name.capitalize(),
-                "',\n            '".join(mapped['fields']),
-                "" if len(self.validators) == 0 else """
-        validators = [%s
-        ]""" % ",".join(self.validators)
-            ))
-        with open(init_path, "a+") as file:
-            file.write("from .%s import %s\n" % (name, name.capitalize(),))
+  Scenario: List {1}s right after creating one
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And the replicas lag behind the primary database
+    When i prepare a request to /{0}/1.0/{1}/
+      {3}
+      And i send the request using POST
+    Then the return code is 201
+    When i prepare a request to /{0}/1.0/{1}/
+      And i send the request using GET
+    Then the return code is 200
+      And the returned {4} contain 1 elements
+""".format(
+            app,
+            name,
+            self.model_name,
+            "\n      ".join([
+                "And i provide %s %s" % (
+                    field,
+                    mapped['test_generators'][field]('First')
+                ) for field in mapped['fields']
+                if field not in self.read_only
+            ]),
+            "array" if self.pagination == 'none' else "page"
+        )
 
     @staticmethod
-    def _generate_testing_values(mapped, key, show_all=True):
-        return ",\n        ".join([
-            "%s='%s'" % (
-                element,
-                mapped['test_generators'][element](key)
-            ) for element in mapped['fields']
-            if element in mapped['test_required'] or show_all
+    def _checks_safe_objects(perms):
+        """Whether the permission class of ``perms`` checks objects for safe methods (see ``checks_safe_objects``)."""
+        return perms in ('object', 'object_or_read_only')
+
+    def _query_budgets(self, mapped, perms):
+        """
+        Return the number of queries of list, retrieve and create requests made by a superuser, from the options the
+        viewset is generated with. Permission classes make no query for superusers.
+        """
+        related = len(mapped['prefetch_related'])
+        listed = 1 + (0 if self.list_serializer else related)
+        retrieved = 1 + related
+        # The conditional list aggregates the version column of the filtered queryset before listing it
+        filtered = 2 if self.conditional and mapped['version_field'] else 1
+        if perms == 'object':
+            # ObjectPermissionsFilter resolves the content type of the view permission each time it filters
+            listed += filtered
+        if self.pagination == 'page':
+            listed += 1
+        listed += filtered - 1
+        if self.cache and self._checks_safe_objects(perms):
+            # CacheMixin loads the object to check its permissions before reading the cache
+            retrieved += 1
+        # The created object is serialized without select_related : its reverse one-to-one relations, and all its
+        # single relations once nested, are loaded by one query each
+        created = 1 + related + len([
+            name for name in mapped['select_related']
+            if mapped['nested'] or any(
+                isinstance(prop, models.OneToOneRel) and prop.get_accessor_name() == name
+                for prop in self.model._meta.get_fields()
+            )
         ])
+        if self.unique == 'constraints':
+            # Savepoint and release, and a single query for unique_for_* validators
+            created += 2 + (1 if self.unique_for else 0)
+        else:
+            created += len(self.validators) + len([
+                prop for prop in self.model._meta.concrete_fields
+                if prop.unique and prop.name in mapped['fields'] and prop.name not in self.read_only
+            ])
+        return listed, retrieved, created
 
-    def _generate_behavior_maker(self, app, name, mapped):
-        root = os.path.join(settings.BASE_DIR, "features")
-        if not os.path.isdir(root):
-            os.mkdir(root)
-        steps = os.path.join(root, "steps")
-        if not os.path.isdir(steps):
-            os.mkdir(steps)
-            init = os.path.join(steps, "__init__.py")
-            with open(init, "w+") as file:
-                file.write("from django_rest_generators.steps"
-                           " import authentication, database, http\n")
-        path = os.path.join(steps, "%s.%s.py" % (app, name))
-        with open(path, "w+") as file:
-            file.write("""from behave import use_step_matcher, given
-from {0}.models import {1}
+    def _generate_budget_tests(self, app, name, mapped):
+        if not self.budgets:
+            return ''
+        listed, retrieved, created = mapped['query_budgets']
+        return """
+  Scenario: List {1}s within budget
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/
+      And i send the request using GET
+    Then the return code is 200
+      And the request executed at most {4} queries
+{7}
 
+  Scenario: Retrieve a {1} within budget
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/{2}/
+      And i send the request using GET
+    Then the return code is 200
+      And the request executed at most {5} queries
+{7}
 
-use_step_matcher('re')
+  Scenario: Create a {1} within budget
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+    When i prepare a request to /{0}/1.0/{1}/
+      {3}
+      And i send the request using POST
+    Then the return code is 201
+      And the request executed at most {6} queries
+{7}
+""".format(
+            app,
+            name,
+            mapped['test_generators'][mapped['lookup_field']]('First'),
+            "\n      ".join([
+                "And i provide %s %s" % (
+                    field,
+                    mapped['test_generators'][field]('First')
+                ) for field in mapped['fields']
+                if field not in self.read_only
+            ]),
+            listed,
+            retrieved,
+            created,
+            "\n      And the request completed in under %d ms" % self.latency_budget if self.latency_budget else ""
+        )
 
+    def _generate_filter_scenario(self, app, name, title, params, count):
+        return """
+  Scenario: Filter {1}s {2}
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/
+      {3}
+      And i send the request using GET
+    Then the return code is {4}{5}
+""".format(
+            app,
+            name,
+            title,
+            "\n      ".join([
+                "And i set the query parameter %s to %s" % param for param in params
+            ]),
+            200 if count is not None else 400,
+            "" if count is None else "\n      And the returned %s contain %d elements" % (
+                "array" if self.pagination == 'none' else "page",
+                count
+            )
+        )
 
-@given(r'a basic set of {2} exists in the database')
-def given_a_basic_set_of_{2}_exists(context):
-    {1}.objects.create(
-        {3}
-    )
-    {1}.objects.create(
-        {4}
-    )
+    def _generate_filter_tests(self, app, name, mapped):
+        if not self.filters or not mapped['filter_lookups']:
+            return ''
+        tests = ''
+        filtered = [field for field, _ in mapped['filter_lookups']]
+        for field, lookups in mapped['filter_lookups']:
+            prop = self.model._meta.get_field(field)
+            if getattr(prop, 'auto_now', False) or getattr(prop, 'auto_now_add', False):
+                continue
+            value = '%s' % mapped['test_generators'][field]('First')
+            if isinstance(prop, models.BooleanField):
+                # Query strings usually spell booleans in lower case
+                value = value.lower()
+            tests += self._generate_filter_scenario(app, name, "by %s" % field, [(field, value)], 1)
+            if 'lte' in lookups:
+                tests += self._generate_filter_scenario(
+                    app, name, "by %s range" % field, [('%s__lte' % field, value)], 1
+                )
+            if 'startswith' in lookups:
+                tests += self._generate_filter_scenario(
+                    app, name, "by %s prefix" % field, [('%s__startswith' % field, value[:3])], 1
+                )
+        invalid = [
+            field for field, lookups in mapped['filter_lookups']
+            if not isinstance(self.model._meta.get_field(field), models.CharField)
+        ]
+        if invalid:
+            tests += self._generate_filter_scenario(
+                app, name, "with an invalid value", [(invalid[0], 'invalid_value')], None
+            )
+        others = [field for field in mapped['fields'] if field not in filtered]
+        if others:
+            tests += self._generate_filter_scenario(
+                app, name, "by a field that is not indexed",
+                [(others[0], mapped['test_generators'][others[0]]('First'))], 2
+            )
+        ordered = [
+            field for field in filtered
+            if field in mapped['test_required'] and field not in self.read_only
+            and mapped['test_generators'][field]('First') < mapped['test_generators'][field]('Second')
+        ]
+        if self.pagination != 'cursor' and ordered:
+            lookup = mapped['lookup_field']
+            tests += """
+  Scenario: Order {1}s by {2}
+    Given a super administrator exists in the database
+      And i am logged in as superadmin
+      And a basic set of {1} exists in the database
+    When i prepare a request to /{0}/1.0/{1}/
+      And i set the query parameter ordering to -{2}
+      And i send the request using GET
+    Then the return code is 200
+      And the returned {3}element 0 have a key named {4} with value {5}
+      And the returned {3}element 1 have a key named {4} with value {6}
 """.format(
                 app,
-                self.model_name,
                 name,
-                Command._generate_testing_values(mapped, "First"),
-                Command._generate_testing_values(mapped, "Second", False)
-            ))
+                ordered[0],
+                "" if self.pagination == 'none' else "page ",
+                lookup,
+                mapped['test_generators'][lookup]('Second'),
+                mapped['test_generators'][lookup]('First')
+            )
+        return tests
 
     def _generate_behavior_tests(self, app, name, mapped):
         path = os.path.join(
@@ -249,7 +1513,8 @@ def given_a_basic_set_of_{2}_exists(context):
             "features",
             "%s.%s.feature" % (app, name)
         )
-        with open(path, "w+") as file:
+        order = self._list_order(mapped)
+        with self._open(path, "w+") as file:
             file.write("""# Created by Django Rest Generators
 Feature: {0} management and persistance
   As autorized user,
@@ -295,7 +1560,7 @@ Feature: {0} management and persistance
     When i prepare a request to /{2}/1.0/{1}/
       And i send the request using GET
     Then the return code is 200
-      And the returned array contain 2 elements
+      And the returned {16} contain 2 elements
       {8}
       {9}
 
@@ -305,7 +1570,7 @@ Feature: {0} management and persistance
     When i prepare a request to /{2}/1.0/{1}/
       And i send the request using GET
     Then the return code is 200
-      And the returned array contain 0 elements
+      And the returned {16} contain 0 elements
 
   Scenario: Update a {1}
     Given a super administrator exists in the database
@@ -342,7 +1607,7 @@ Feature: {0} management and persistance
     When i prepare a request to /{2}/1.0/{1}/{5}/
       And i send the request using DELETE
     Then the return code is 204
-      And no {2}.{1} exists with uuid {5}
+      And no {2}.{1} exists with {18} {5}
 
   Scenario: Delete a non-existing {1}
     Given a super administrator exists in the database
@@ -350,7 +1615,7 @@ Feature: {0} management and persistance
     When i prepare a request to /{2}/1.0/{1}/{4}/
       And i send the request using DELETE
     Then the return code is 404
-""".format(
+{17}""".format(
                 self.model_name,
                 name,
                 app,
@@ -372,19 +1637,8 @@ Feature: {0} management and persistance
                     if field in mapped['test_required']
                     and field not in self.read_only
                 ]),
-                "\n      ".join([
-                    "And the returned element 0 have a key named %s with value %s" % (
-                        field,
-                        mapped['test_generators'][field]('First')
-                    ) for field in mapped['fields']
-                ]),
-                "\n      ".join([
-                    "And the returned element 1 have a key named %s with value %s" % (
-                        field,
-                        mapped['test_generators'][field]('Second')
-                    ) for field in mapped['fields']
-                    if field in mapped['test_required']
-                ]),
+                self._generate_list_checks(mapped, 0, order[0]),
+                self._generate_list_checks(mapped, 1, order[1]),
                 "\n      ".join([
                     "And the return value for %s is %s" % (
                         field,
@@ -431,9 +1685,43 @@ Feature: {0} management and persistance
                         mapped['test_generators'][field]('Update')
                     ) for field in mapped['fields']
                     if field not in self.read_only
-                ])
+                ]),
+                "array" if self.pagination == 'none' else "page",
+                self._generate_pagination_tests(app, name, mapped) +
+                self._generate_export_tests(app, name, mapped) +
+                self._generate_sparse_fields_tests(app, name, mapped) +
+                self._generate_bulk_tests(app, name, mapped) +
+                self._generate_conditional_tests(app, name, mapped) +
+                self._generate_cache_tests(app, name, mapped) +
+                self._generate_unique_tests(app, name, mapped) +
+                self._generate_filter_tests(app, name, mapped) +
+                self._generate_list_serializer_tests(app, name, mapped) +
+                self._generate_renderers_tests(app, name, mapped) +
+                self._generate_replicas_tests(app, name, mapped) +
+                self._generate_budget_tests(app, name, mapped),
+                mapped['lookup_field']
             ))
 
+    def _generate_queryset(self, mapped):
+        if not mapped['select_related'] and not mapped['prefetch_related']:
+            return ''
+        optimizations = ''
+        if mapped['select_related']:
+            optimizations += """.select_related(
+            '%s'
+        )""" % "',\n            '".join(mapped['select_related'])
+        if mapped['prefetch_related']:
+            optimizations += """.prefetch_related(
+            '%s'
+        )""" % "',\n            '".join(mapped['prefetch_related'])
+        return """
+    def get_queryset(self):
+        return super(%s, self).get_queryset()%s
+""" % (
+            self.model_name,
+            optimizations
+        )
+
     def _generate_viewset(self, app, name, mapped, perms):
         viewset_path = os.path.join(
             settings.BASE_DIR,
@@ -443,7 +1731,7 @@ Feature: {0} management and persistance
         viewset_file = os.path.join(viewset_path, "%s.py" % name)
         viewset_init = os.path.join(viewset_path, "__init__.py")
         drf_import = ''
-        drg_import = ''
+        drg_modules = []
         if perms == "everyone":
             perms_classes = 'AllowAny'
             drf_import = ', permissions'
@@ -455,7 +1743,7 @@ Feature: {0} management and persistance
             drf_import = ', permissions'
         elif perms == 'model':
             perms_classes = 'DjangoModelPermissionsWithRead'
-            drg_import = 'from django_rest_generators import permissions\n'
+            drg_modules.append('permissions')
         elif perms == 'model_or_read_only':
             perms_classes = 'DjangoModelPermissions'
             drf_import = ', permissions'
@@ -464,40 +1752,149 @@ Feature: {0} management and persistance
             drf_import = ', permissions'
         elif perms == 'object':
             perms_classes = 'DjangoObjectPermissionsWithRead'
-            drg_import = 'from django_rest_generators import permissions\n'
+            drg_modules.append('permissions')
         elif perms == 'object_or_read_only':
             perms_classes = 'DjangoObjectPermissions'
-            drf_import = ', permissions'
+            drg_modules.append('permissions')
         elif perms == 'object_or_anon_read_only':
             perms_classes = 'DjangoObjectPermissionsOrAnonReadOnly'
-            drg_import = 'from django_rest_generators import permissions\n'
+            drg_modules.append('permissions')
         else:
             perms_classes = 'IsAdminUser'
             drf_import = ', permissions'
-        with open(viewset_file, "w+") as file:
+        filter_backends = []
+        if perms == 'object':
+            filter_backends.append('filters.ObjectPermissionsFilter')
+        filter_lookups = ''
+        if self.filters and mapped['filter_lookups']:
+            filter_backends.append('filters.FieldFilter')
+            filter_lookups = """
+    filter_lookups = {
+        %s
+    }""" % ",\n        ".join([
+                "'%s': (%s)" % (field, ", ".join(["'%s'" % lookup for lookup in lookups]) + (
+                    "," if len(lookups) == 1 else ""
+                )) for field, lookups in mapped['filter_lookups']
+            ])
+            if self.pagination != 'cursor':
+                filter_backends.append('filters.OrderingFilter')
+                filter_lookups += """
+    ordering_fields = (
+        %s,
+    )""" % ",\n        ".join(["'%s'" % field for field, _ in mapped['filter_lookups']])
+        if filter_backends:
+            drg_modules.append('filters')
+        pagination_class = ''
+        if self.pagination != 'none':
+            drg_modules.append('pagination')
+            pagination_class = """
+    pagination_class = pagination.%s
+    ordering = ('%s',)""" % (
+                'CursorPagination' if self.pagination == 'cursor' else 'PageNumberPagination',
+                mapped['ordering']
+            )
+        bases = ['viewsets.ModelViewSet']
+        if self.export:
+            bases.insert(-1, 'mixins.ExportMixin')
+        if self.bulk:
+            bases.insert(-1, 'mixins.BulkMixin')
+        conditional_field = ''
+        if self.conditional:
+            bases.insert(-1, 'mixins.ConditionalMixin')
+            if mapped['version_field']:
+                conditional_field = """
+    conditional_field = '%s'""" % mapped['version_field']
+        cache = ''
+        cache_connect = ''
+        if self.cache:
+            bases.insert(-1, 'mixins.CacheMixin')
+            if perms.startswith('object'):
+                cache += """
+    cache_per_user = True"""
+            if mapped['related_models']:
+                cache += """
+    cache_related = (
+        %s,
+    )""" % ",\n        ".join(["'%s'" % label for label in mapped['related_models']])
+            cache_connect = """
+
+%s.connect_cache_invalidation()
+""" % self.model_name
+        list_serializer = ''
+        if self.list_serializer:
+            bases.insert(-1, 'mixins.ListSerializerMixin')
+            list_serializer = """
+    list_serializer_class = serializers.%sList""" % self.model_name
+        sparse_fields = ''
+        if self.sparse_fields:
+            bases.insert(-1, 'mixins.SparseFieldsMixin')
+            sparse_fields = """
+    sparse_fields = (
+        %s,
+    )""" % ",\n        ".join([
+                "'%s'" % field for field in mapped['fields'] + mapped['relations']
+            ])
+        if self.fast_read:
+            bases.insert(-1, 'mixins.ValuesMixin')
+        if self.replicas:
+            bases.insert(-1, 'mixins.ReplicaMixin')
+        if len(bases) > 1:
+            drg_modules.append('mixins')
+        renderers = ''
+        if self.renderers != 'none':
+            drg_modules += ['parsers', 'renderers']
+            formats = [('JSONRenderer', 'JSONParser')]
+            if self.renderers == 'msgpack':
+                formats.append(('MessagePackRenderer', 'MessagePackParser'))
+            renderers = """
+    renderer_classes = [
+        %s
+    ]
+    parser_classes = [
+        %s
+    ]""" % (
+                ",\n        ".join(["renderers.%s" % renderer for renderer, _ in formats]),
+                ",\n        ".join(["parsers.%s" % parser for _, parser in formats])
+            )
+        drg_import = ''
+        if drg_modules:
+            drg_import = 'from django_rest_generators import %s\n' % ', '.join(drg_modules)
+        with self._open(viewset_file, "w+") as file:
             file.write("""%sfrom rest_framework import viewsets%s
 from %s import models, serializers
 
 
-class %s(viewsets.ModelViewSet):
-    serializer_class = serializers.%s
+class %s(%s):
+    serializer_class = serializers.%s%s
     queryset = models.%s.objects.all()
-    lookup_field = '%s'
+    lookup_field = '%s'%s%s%s%s%s%s%s
     permission_classes = [
         permissions.%s
     ]
-""" % (
+%s""" % (
                 drg_import,
                 drf_import,
                 app,
                 self.model_name,
+                ', '.join(bases),
                 self.model_name,
+                list_serializer,
                 self.model_name,
                 mapped['lookup_field'],
-                perms_classes
+                sparse_fields,
+                conditional_field,
+                cache,
+                "" if not filter_backends else """
+    filter_backends = [
+        %s
+    ]""" % ",\n        ".join(filter_backends),
+                filter_lookups,
+                pagination_class,
+                renderers,
+                perms_classes,
+                self._generate_queryset(mapped) + cache_connect
             ))
-        with open(viewset_init, "a+") as file:
-            file.write("from .%s import %s\n" % (name, self.model_name))
+        self._append_line(viewset_init, "from .%s import %s" % (name, self.model_name))
 
     def _generate_routes(self, app, name):
         path = os.path.join(
@@ -505,17 +1902,65 @@ class %s(viewsets.ModelViewSet):
             app,
             "urls.py"
         )
-        with open(path, "r+") as file:
+        registration = "router.register(r'%s', viewsets.%s)" % (name, self.model_name)
+        with self._open(path, "r+") as file:
             content = file.read()
+            if registration in content:
+                return
             file.seek(0)
             file.truncate()
             content = content.replace('router = DefaultRouter()', '''router = DefaultRouter()
-router.register(r'%s', viewsets.%s)''' % (name, self.model_name))
+%s''' % registration)
             file.write(content)
 
     def add_arguments(self, parser):
         parser.add_argument('app', help='Target application name')
-        parser.add_argument('name', help='Target model name')
+        parser.add_argument('name', nargs='*', help='Target model names')
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Generate every model of the application'
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Report generated files that are out of date, without writing them'
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Keep running and regenerate models when their files change'
+        )
+        parser.add_argument(
+            '--filters',
+            action='store_true',
+            help='Allow clients to filter and order the list on indexed fields'
+        )
+        parser.add_argument(
+            '--list-serializer',
+            action='store_true',
+            help='Use a lightweight read-only serializer for the list endpoint'
+        )
+        parser.add_argument(
+            '--list-fields',
+            default=None,
+            help='Comma separated fields returned by the list endpoint (implies --list-serializer)'
+        )
+        parser.add_argument(
+            '--fast-read',
+            action='store_true',
+            help='Serve list and retrieve from values() rows instead of model instances'
+        )
+        parser.add_argument(
+            '--indexes',
+            action='store_true',
+            help='Add the indexes needed by the generated API to the models Meta'
+        )
+        parser.add_argument(
+            '--index-report',
+            action='store_true',
+            help='List the indexes needed by the generated API that are missing, without writing anything'
+        )
         parser.add_argument(
             '--permissions',
             '-p',
@@ -534,6 +1979,86 @@ router.register(r'%s', viewsets.%s)''' % (name, self.model_name))
                 'admin',
             ]
         )
+        parser.add_argument(
+            '--relations',
+            '-r',
+            default='pk',
+            help='How related fields are exposed in the serializer',
+            choices=[
+                'none',
+                'pk',
+                'nested',
+            ]
+        )
+        parser.add_argument(
+            '--pagination',
+            default='none',
+            help='Pagination used by the list endpoint',
+            choices=[
+                'none',
+                'page',
+                'cursor',
+            ]
+        )
+        parser.add_argument(
+            '--export',
+            action='store_true',
+            help='Add a streaming NDJSON/CSV export action to the viewset'
+        )
+        parser.add_argument(
+            '--sparse-fields',
+            action='store_true',
+            help='Allow clients to select returned fields with ?fields= and ?omit='
+        )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Add bulk create, update and delete actions to the viewset'
+        )
+        parser.add_argument(
+            '--conditional',
+            action='store_true',
+            help='Send ETag/Last-Modified headers and honour conditional GET requests'
+        )
+        parser.add_argument(
+            '--cache',
+            action='store_true',
+            help='Cache serialized detail and list responses, invalidated on save and delete'
+        )
+        parser.add_argument(
+            '--budgets',
+            action='store_true',
+            help='Check the number of queries of list, retrieve and create requests'
+        )
+        parser.add_argument(
+            '--latency-budget',
+            type=int,
+            help='Also check that the requests checked by --budgets complete in this many milliseconds'
+        )
+        parser.add_argument(
+            '--replicas',
+            action='store_true',
+            help='Read safe requests from the replica databases'
+        )
+        parser.add_argument(
+            '--renderers',
+            default='none',
+            help='Render and parse requests with fast JSON, or fast JSON and MessagePack',
+            choices=[
+                'none',
+                'json',
+                'msgpack',
+            ]
+        )
+        parser.add_argument(
+            '--unique',
+            default='validators',
+            help='How uniqueness is validated',
+            choices=[
+                'validators',
+                'constraints',
+            ]
+        )
 
     def _generate_permissions_tests(
             self,
@@ -550,7 +2075,7 @@ router.register(r'%s', viewsets.%s)''' % (name, self.model_name))
             "features",
             "%s.%s.feature" % (app, name)
         )
-        with open(path, "a+") as file:
+        with self._open(path, "a+") as file:
             for i in range(0, len(scenarios)):
                 file.write("""
 Scenario: (Create) %s
@@ -1068,16 +2593,176 @@ Then the return code is %s
             results_safe,
             results_unsafe
         )
+        if perms == 'object':
+            self._generate_object_list_tests(app, name, mapped)
+
+    def _generate_object_list_tests(self, app, name, mapped):
+        path = os.path.join(
+            settings.BASE_DIR,
+            "features",
+            "%s.%s.feature" % (app, name)
+        )
+        with self._open(path, "a+") as file:
+            file.write("""
+Scenario: (List) Test logged with rights over a single object
+Given a basic set of %s exists in the database
+  And a basic set of users exists in the database
+  And i am logged in as allowed_user
+  And user allowed_user have permission %s.view_%s
+  And user allowed_user have permission %s.view_%s over a %s.%s with %s %s
+When i prepare a request to /%s/1.0/%s/
+  And i send the request using GET
+Then the return code is 200
+  And the returned %s contain 1 elements
+""" % (
+                name,
+                app,
+                name,
+                app,
+                name,
+                app,
+                self.model_name,
+                mapped['lookup_field'],
+                mapped['test_generators'][mapped['lookup_field']]('First'),
+                app,
+                name,
+                "array" if self.pagination == 'none' else "page"
+            ))
 
     def handle(self, *args, **options):
         app = options['app']
-        name = options['name']
         perms = options['permissions']
+        self.unique = options['unique']
+        self.pagination = options['pagination']
+        self.export = options['export']
+        self.sparse_fields = options['sparse_fields']
+        self.bulk = options['bulk']
+        self.conditional = options['conditional']
+        self.cache = options['cache']
+        self.indexes = options['indexes']
+        self.filters = options['filters']
+        self.list_serializer = options['list_serializer'] or options['list_fields'] is not None
+        self.fast_read = options['fast_read']
+        self.renderers = options['renderers']
+        self.replicas = options['replicas']
+        self.budgets = options['budgets']
+        self.latency_budget = options['latency_budget']
+        if not options['all'] and not options['name']:
+            raise CommandError('Give at least one model name, or use --all')
+        if options['index_report']:
+            self._report_indexes(app, self._names(app, options), options['relations'])
+            return
+        if options['check'] and options['watch']:
+            raise CommandError('--check and --watch can not be used together')
+        self.check_only = options['check']
+        self._generate(app, perms, options)
+        if options['watch']:
+            self._watch(app, perms, options)
+
+    @staticmethod
+    def _names(app, options):
+        if options['all']:
+            return [model._meta.model_name for model in apps.get_app_config(app).get_models()]
+        return options['name']
+
+    def _reset_model_state(self):
+        self.include_validators = False
+        self.validators = []
+        self.read_only = []
+        self.related_imports = []
+        self.unique_fields = []
+        self.unique_for = []
+
+    def _generate(self, app, perms, options):
+        names = Command._names(app, options)
+        self.manifest = self._load_manifest()
+        self.pending = {}
+        for name in names:
+            self._generate_model(app, name, perms, options)
+        files = self.manifest['files']
+        for path, content in self.pending.items():
+            files[os.path.relpath(path, settings.BASE_DIR)] = Command._hash(content)
+        if not self.check_only:
+            self.pending[self._manifest_path()] = "%s\n" % json.dumps(self.manifest, indent=2, sort_keys=True)
+        changed = self._flush()
+        if self.check_only and changed:
+            for path in changed:
+                self.stdout.write("%s is out of date" % os.path.relpath(path, settings.BASE_DIR))
+            raise CommandError("%d generated files are out of date" % len(changed))
+        return changed
+
+    @staticmethod
+    def _reload_models(app, paths):
+        config = apps.get_app_config(app)
+        package = config.models_module.__name__
+        is_package = hasattr(config.models_module, '__path__')
+        models_module = '__init__' if is_package else 'models'
+        modules = []
+        for path in paths:
+            module = os.path.splitext(os.path.basename(path))[0]
+            if module == models_module:
+                modules.append((package, path))
+            elif is_package:
+                modules.insert(0, ('%s.%s' % (package, module), path))
+        for module, path in modules:
+            for model in list(config.get_models()):
+                if model.__module__ == module:
+                    del apps.all_models[app][model._meta.model_name]
+            if not os.path.exists(path):
+                sys.modules.pop(module, None)
+            elif module in sys.modules:
+                importlib.reload(sys.modules[module])
+            else:
+                importlib.import_module(module)
+        apps.clear_cache()
+        return modules
+
+    def _watch(self, app, perms, options):
+        directory = os.path.dirname(apps.get_app_config(app).models_module.__file__)
+        watcher = watchers.get_watcher(directory)
+        self.stdout.write("Watching %s for changes (%s)" % (directory, watcher.__class__.__name__))
+        try:
+            while True:
+                paths = watcher.wait()
+                start = time.time()
+                try:
+                    if not Command._reload_models(app, paths):
+                        continue
+                    changed = self._generate(app, perms, options)
+                except Exception as error:
+                    self.stderr.write("%s: %s" % (error.__class__.__name__, error))
+                    continue
+                for path in changed:
+                    if path != self._manifest_path():
+                        self.stdout.write("Updated %s" % os.path.relpath(path, settings.BASE_DIR))
+                self.stdout.write("Regenerated in %d ms" % ((time.time() - start) * 1000))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+
+    def _generate_model(self, app, name, perms, options):
         self._import_model(app, name)
-        mapped = self._map_properties()
+        key = '%s.%s' % (app, name)
+        signature = self._signature(options)
+        if self._is_up_to_date(key, signature):
+            return
+        self.touched = []
+        self._reset_model_state()
+        mapped = self._map_properties(app, options['relations'])
+        if self.indexes:
+            self._generate_indexes(mapped)
+        mapped['filter_lookups'] = self._filter_lookups(mapped) if self.filters else []
+        mapped['list_fields'] = self._list_fields(mapped, options['list_fields']) \
+            if self.list_serializer else mapped['fields'] + mapped['relations']
+        mapped['query_budgets'] = self._query_budgets(mapped, perms) if self.budgets else None
         self._generate_serializer(app, name, mapped)
         self._generate_behavior_maker(app, name, mapped)
         self._generate_behavior_tests(app, name, mapped)
         self._generate_viewset(app, name, mapped, perms)
         self._generate_tests_for_permissions(app, name, mapped, perms)
         self._generate_routes(app, name)
+        self.manifest['models'][key] = {
+            'signature': signature,
+            'files': sorted(os.path.relpath(path, settings.BASE_DIR) for path in self.touched)
+        }
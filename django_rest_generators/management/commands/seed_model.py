@@ -0,0 +1,55 @@
+import itertools
+import time
+from django.apps import apps
+from django.core.management import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, reset_queries, transaction
+from django_rest_generators.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = 'Fill a model table with generated rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('app', help='Target application name')
+        parser.add_argument('name', help='Target model name')
+        parser.add_argument('--rows', type=int, default=1000, help='Number of rows to insert')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of rows per INSERT query')
+        parser.add_argument(
+            '--transaction-size',
+            type=int,
+            default=10000,
+            help='Number of rows per transaction, progress is reported after each of them'
+        )
+        parser.add_argument('--seed', default='0', help='Seed of the generated values')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database to fill')
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['app'], options['name'])
+        except LookupError as exc:
+            raise CommandError(str(exc))
+        rows = options['rows']
+        batch_size = options['batch_size']
+        database = options['database']
+        if rows < 1 or batch_size < 1:
+            raise CommandError('--rows and --batch-size must be positive')
+        try:
+            seeder = Seeder(model, rows, options['seed'], database)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        batches = seeder.batches(batch_size)
+        per_transaction = max(options['transaction_size'] // batch_size, 1)
+        started = time.perf_counter()
+        done = 0
+        while done < rows:
+            with transaction.atomic(using=database):
+                for objects in itertools.islice(batches, per_transaction):
+                    seeder.manager.bulk_create(objects, batch_size=batch_size)
+                    done += len(objects)
+            # With DEBUG, the SQL of every INSERT would be kept in memory
+            reset_queries()
+            self.stdout.write('%d/%d rows, %d rows/sec' % (done, rows, done / (time.perf_counter() - started)))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            'Inserted %d %s rows in %.2fs (%d rows/sec)' % (rows, model._meta.label, elapsed, rows / elapsed)
+        ))
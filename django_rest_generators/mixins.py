@@ -0,0 +1,914 @@
+import calendar
+import csv
+import datetime
+import hashlib
+import json
+import uuid
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Count, DateTimeField, Max, Q, Sum, prefetch_related_objects
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import exceptions, permissions, relations, serializers, status, validators
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from django_rest_generators import databases
+from django_rest_generators.validators import CombinedUniqueValidator, column_value
+
+
+def _checks_objects(view):
+    """
+    Whether one of the permissions of the view checks the objects themselves for this request. Permissions allowing
+    every object for safe methods tell it with ``checks_safe_objects = False``.
+    """
+    safe = view.request.method in permissions.SAFE_METHODS
+    return any(
+        type(permission).has_object_permission is not permissions.BasePermission.has_object_permission and
+        not (safe and not getattr(permission, 'checks_safe_objects', True))
+        for permission in view.get_permissions()
+    )
+
+
+class _Echo(object):
+    @staticmethod
+    def write(value):
+        return value
+
+
+class ExportMixin(object):
+    export_chunk_size = 2000
+    export_formats = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv',
+    }
+
+    def _export_chunks(self, queryset):
+        # iterator() ignores prefetch_related before Django 4.1 : relations are prefetched for each chunk instead
+        lookups = queryset._prefetch_related_lookups
+        chunk = []
+        for instance in queryset.prefetch_related(None).iterator(chunk_size=self.export_chunk_size):
+            chunk.append(instance)
+            if len(chunk) == self.export_chunk_size:
+                prefetch_related_objects(chunk, *lookups)
+                yield chunk
+                chunk = []
+        if chunk:
+            prefetch_related_objects(chunk, *lookups)
+            yield chunk
+
+    def _export_rows(self, queryset, serializer):
+        for chunk in self._export_chunks(queryset):
+            for instance in chunk:
+                yield serializer.to_representation(instance)
+
+    @staticmethod
+    def _export_ndjson(rows, fields):
+        for row in rows:
+            yield "%s\n" % json.dumps(row, cls=JSONEncoder)
+
+    @staticmethod
+    def _export_csv(rows, fields):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow([row.get(field) for field in fields])
+
+    @action(detail=False, methods=['get'])
+    def export(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in self.export_formats:
+            raise exceptions.ValidationError({
+                'export_format': ['Unknown export format "%s".' % export_format]
+            })
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = getattr(self, 'ordering', None)
+        if ordering and not queryset.ordered:
+            queryset = queryset.order_by(*ordering)
+        serializer = self.get_serializer()
+        fields = [
+            name for name, field in serializer.fields.items()
+            if not field.write_only
+        ]
+        rows = self._export_rows(queryset, serializer)
+        if export_format == 'csv':
+            content = self._export_csv(rows, fields)
+        else:
+            content = self._export_ndjson(rows, fields)
+        response = StreamingHttpResponse(
+            content,
+            content_type=self.export_formats[export_format]
+        )
+        response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (
+            queryset.model._meta.model_name,
+            export_format
+        )
+        return response
+
+
+class SparseFieldsSerializerMixin(object):
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super(SparseFieldsSerializerMixin, self).__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin(object):
+    sparse_fields = ()
+
+    def _parse_sparse_fields(self, param):
+        value = self.request.query_params.get(param)
+        if value is None:
+            return None
+        fields = [field.strip() for field in value.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in self.sparse_fields]
+        if unknown:
+            raise exceptions.ValidationError({
+                param: ['Unknown field "%s".' % field for field in unknown]
+            })
+        return fields
+
+    def get_sparse_fields(self):
+        if self.request.method not in permissions.SAFE_METHODS:
+            return None
+        if not hasattr(self, '_sparse_fields'):
+            fields = self._parse_sparse_fields('fields')
+            omit = self._parse_sparse_fields('omit')
+            if omit is not None:
+                fields = [
+                    field for field in (fields or self.sparse_fields)
+                    if field not in omit
+                ]
+            self._sparse_fields = fields
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super(SparseFieldsMixin, self).get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super(SparseFieldsMixin, self).filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        names = list(fields)
+        if isinstance(queryset.query.select_related, dict):
+            names += list(queryset.query.select_related)
+        meta = queryset.model._meta
+        columns = {meta.pk.name}
+        for name in names:
+            try:
+                field = meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                columns.add(name)
+        return queryset.only(*columns)
+
+
+class UniqueConstraintSerializerMixin(object):
+    def get_unique_fields(self):
+        meta = self.Meta.model._meta
+        unique = []
+        for name, field in self.fields.items():
+            if field.read_only:
+                continue
+            try:
+                if meta.get_field(field.source).unique:
+                    unique.append(field.source)
+            except FieldDoesNotExist:
+                continue
+        return unique
+
+    def _unique_errors(self, validated_data, instance=None):
+        values = {
+            name: validated_data[name] for name in self.get_unique_fields()
+            if validated_data.get(name) is not None
+        }
+        if not values:
+            return {}
+        query = Q()
+        for name, value in values.items():
+            query |= Q(**{name: value})
+        queryset = self.Meta.model._default_manager.filter(query)
+        if instance is not None:
+            queryset = queryset.exclude(pk=instance.pk)
+        fields = {name: self.Meta.model._meta.get_field(name) for name in values}
+        errors = {}
+        for row in queryset.values(*[field.attname for field in fields.values()]):
+            for name, value in values.items():
+                if row[fields[name].attname] == column_value(fields[name], value):
+                    errors[name] = [validators.UniqueValidator.message]
+        return errors
+
+    def _save_unique(self, method, validated_data, instance=None):
+        try:
+            with transaction.atomic():
+                if instance is None:
+                    return method(validated_data)
+                return method(instance, validated_data)
+        except IntegrityError:
+            errors = self._unique_errors(validated_data, instance)
+            if not errors:
+                raise
+            raise exceptions.ValidationError(errors, code='unique')
+
+    def create(self, validated_data):
+        return self._save_unique(
+            super(UniqueConstraintSerializerMixin, self).create,
+            validated_data
+        )
+
+    def update(self, instance, validated_data):
+        return self._save_unique(
+            super(UniqueConstraintSerializerMixin, self).update,
+            validated_data,
+            instance
+        )
+
+
+class BulkMixin(object):
+    bulk_batch_size = 500
+    bulk_unique_for = {
+        validators.UniqueForDateValidator: 'date',
+        validators.UniqueForMonthValidator: 'month',
+        validators.UniqueForYearValidator: 'year',
+    }
+
+    def _bulk_serializer(self, **kwargs):
+        """
+        Return the serializer without its unique validators, and the unique sets they checked, as ``(fields,
+        date_field, kind, error_key, message)`` tuples : ``_bulk_check_unique`` checks them for every row at once.
+        """
+        serializer = self.get_serializer(**kwargs)
+        sets = []
+        for name, field in serializer.fields.items():
+            kept = [
+                validator for validator in field.validators
+                if not isinstance(validator, validators.UniqueValidator)
+            ]
+            if len(kept) != len(field.validators) and not field.read_only:
+                sets.append(((field.source,), None, None, name, validators.UniqueValidator.message))
+            field.validators = kept
+        if isinstance(serializer, UniqueConstraintSerializerMixin):
+            sets += [
+                ((name,), None, None, name, validators.UniqueValidator.message)
+                for name in serializer.get_unique_fields()
+            ]
+        kept = []
+        for validator in serializer.validators:
+            if isinstance(validator, CombinedUniqueValidator):
+                sets += [((name,), None, None, name, validators.UniqueValidator.message) for name in validator.fields]
+                sets += [
+                    ((name,), date_field, kind, name, validator.messages[kind].format(date_field=date_field))
+                    for kind, name, date_field in validator.dates
+                ]
+            elif type(validator) in self.bulk_unique_for:
+                sets.append((
+                    (validator.field,),
+                    validator.date_field,
+                    self.bulk_unique_for[type(validator)],
+                    validator.field,
+                    validator.message.format(date_field=validator.date_field)
+                ))
+            elif isinstance(validator, validators.UniqueTogetherValidator):
+                sets.append((
+                    tuple(serializer.fields[name].source for name in validator.fields),
+                    None,
+                    None,
+                    api_settings.NON_FIELD_ERRORS_KEY,
+                    validator.message.format(field_names=', '.join(validator.fields))
+                ))
+            else:
+                kept.append(validator)
+        serializer.validators = kept
+        return serializer, sets
+
+    def _bulk_rows(self, request):
+        if not isinstance(request.data, list):
+            raise exceptions.ValidationError({
+                'non_field_errors': ['Expected a list of items.']
+            })
+        return request.data
+
+    def _bulk_validate(self, serializer, rows, instances=None):
+        errors = []
+        validated = []
+        for index, row in enumerate(rows):
+            serializer.instance = instances[index] if instances else None
+            try:
+                validated.append(serializer.run_validation(row))
+                errors.append({})
+            except exceptions.ValidationError as exc:
+                validated.append(None)
+                errors.append(exc.detail)
+        serializer.instance = None
+        if any(errors):
+            raise exceptions.ValidationError(errors)
+        return validated
+
+    @staticmethod
+    def _bulk_unique_key(values, date, kind):
+        if kind is None:
+            return tuple(values)
+        return tuple(values) + tuple(getattr(date, part) for part in CombinedUniqueValidator.lookups[kind])
+
+    def _bulk_check_unique(self, sets, validated, instances=None):
+        """Check the unique sets of every row with one query per set, against the table and the other rows."""
+        model = self.get_queryset().model
+        errors = [{} for _ in validated]
+        for names, date_field, kind, key, message in sets:
+            fields = [model._meta.get_field(name) for name in names]
+            rows = {}
+            for index, attrs in enumerate(validated):
+                instance = instances[index] if instances else None
+                # Partial updates keep the current values of the other columns
+                values = [attrs[name] if name in attrs else getattr(instance, name, None) for name in names]
+                date = None
+                if date_field is not None:
+                    date = attrs[date_field] if date_field in attrs else getattr(instance, date_field, None)
+                if None in values or (date_field is not None and date is None):
+                    continue
+                row = self._bulk_unique_key(
+                    [column_value(field, value) for field, value in zip(fields, values)],
+                    date,
+                    kind
+                )
+                if row in rows:
+                    errors[index][key] = [message]
+                rows.setdefault(row, index)
+            if not rows:
+                continue
+            # Filtering on the first column only keeps the query small, the other ones are compared here
+            existing = model._default_manager.filter(**{
+                '%s__in' % fields[0].attname: list({row[0] for row in rows})
+            })
+            if instances:
+                existing = existing.exclude(pk__in=[instance.pk for instance in instances])
+            columns = [field.attname for field in fields] + ([date_field] if date_field is not None else [])
+            for values in existing.values_list(*columns):
+                row = self._bulk_unique_key(values[:len(fields)], values[-1], kind)
+                if row in rows:
+                    errors[rows[row]][key] = [message]
+        if any(errors):
+            raise exceptions.ValidationError(errors)
+
+    def _bulk_instances(self, rows):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup = queryset.model._meta.get_field(self.lookup_field)
+        try:
+            keys = [lookup.to_python(row.get(self.lookup_field)) for row in rows]
+        except (AttributeError, ValidationError):
+            raise exceptions.ValidationError({
+                self.lookup_field: ['Every item must provide a valid %s.' % self.lookup_field]
+            })
+        found = {
+            getattr(instance, self.lookup_field): instance
+            for instance in queryset.filter(**{'%s__in' % self.lookup_field: keys})
+        }
+        missing = [row.get(self.lookup_field) for row, key in zip(rows, keys) if key not in found]
+        if missing:
+            raise exceptions.ValidationError({
+                self.lookup_field: ['Unknown %s "%s".' % (self.lookup_field, value) for value in missing]
+            })
+        instances = [found[key] for key in keys]
+        for permission in self.get_permissions():
+            if hasattr(permission, 'prefetch_object_permissions'):
+                permission.prefetch_object_permissions(self.request, instances)
+        for instance in instances:
+            self.check_object_permissions(self.request, instance)
+        return instances
+
+    @staticmethod
+    def _split_many_to_many(model, attrs):
+        many = {}
+        for field in model._meta.many_to_many:
+            if field.name in attrs:
+                many[field.name] = attrs.pop(field.name)
+        return many
+
+    def _bulk_touch(self, model, instances, updated):
+        """
+        Update the version columns of the instances, as saving them would : ``bulk_update`` does not call ``pre_save``,
+        so ``auto_now`` fields would keep their value and conditional requests would still match the old ETags.
+        """
+        version = getattr(self, 'conditional_field', None)
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                for instance in instances:
+                    field.pre_save(instance, False)
+                updated.add(field.name)
+            elif field.name == version and field.name not in updated:
+                for instance in instances:
+                    setattr(instance, field.attname, (getattr(instance, field.attname) or 0) + 1)
+                updated.add(field.name)
+
+    @staticmethod
+    def _bulk_saved(model, instances, created, updated=None):
+        """Send ``post_save`` for every written instance, as ``bulk_create`` and ``bulk_update`` do not."""
+        for instance in instances:
+            post_save.send(
+                sender=model,
+                instance=instance,
+                created=created,
+                update_fields=frozenset(updated) if updated else None,
+                raw=False,
+                using=instance._state.db
+            )
+
+    def _bulk_insert(self, model, instances):
+        """
+        Insert the instances, and return whether ``post_save`` still has to be sent. Generated keys are needed to relate
+        and return the instances : on backends which do not return them from a bulk insert (SQLite before Django 4.0),
+        the instances are saved one by one.
+        """
+        connection = connections[router.db_for_write(model)]
+        if connection.features.can_return_rows_from_bulk_insert or model._meta.auto_field is None or \
+                all(instance.pk is not None for instance in instances):
+            model._default_manager.bulk_create(instances, batch_size=self.bulk_batch_size)
+            return True
+        for instance in instances:
+            instance.save(force_insert=True)
+        return False
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super(BulkMixin, self).create(request, *args, **kwargs)
+        model = self.get_queryset().model
+        serializer, sets = self._bulk_serializer()
+        validated = self._bulk_validate(serializer, request.data)
+        self._bulk_check_unique(sets, validated)
+        many = [self._split_many_to_many(model, attrs) for attrs in validated]
+        instances = [model(**attrs) for attrs in validated]
+        with transaction.atomic():
+            signals = self._bulk_insert(model, instances)
+            for instance, relations in zip(instances, many):
+                for name, value in relations.items():
+                    getattr(instance, name).set(value)
+        if signals:
+            self._bulk_saved(model, instances, True)
+        return Response(
+            self.get_serializer(instances, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=False, methods=['patch'], url_path='bulk')
+    def bulk_update(self, request, *args, **kwargs):
+        rows = self._bulk_rows(request)
+        instances = self._bulk_instances(rows)
+        model = self.get_queryset().model
+        serializer, sets = self._bulk_serializer(partial=True)
+        validated = self._bulk_validate(serializer, rows, instances)
+        self._bulk_check_unique(sets, validated, instances)
+        updated = set()
+        many = []
+        for instance, attrs in zip(instances, validated):
+            many.append(self._split_many_to_many(model, attrs))
+            for name, value in attrs.items():
+                setattr(instance, name, value)
+                updated.add(name)
+        if updated or any(many):
+            self._bulk_touch(model, instances, updated)
+        with transaction.atomic():
+            if updated:
+                model._default_manager.bulk_update(
+                    instances,
+                    list(updated),
+                    batch_size=self.bulk_batch_size
+                )
+            for instance, relations in zip(instances, many):
+                for name, value in relations.items():
+                    getattr(instance, name).set(value)
+        self._bulk_saved(model, instances, False, updated)
+        return Response(self.get_serializer(instances, many=True).data)
+
+    @bulk_update.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs):
+        instances = self._bulk_instances(self._bulk_rows(request))
+        with transaction.atomic():
+            self.get_queryset().model._default_manager.filter(
+                pk__in=[instance.pk for instance in instances]
+            ).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ConditionalMixin(object):
+    conditional_field = None
+
+    def _etag(self, *parts):
+        content = "|".join([
+            self.request.get_full_path(),
+            self.request.META.get('HTTP_ACCEPT', '')
+        ] + [str(part) for part in parts])
+        return quote_etag(hashlib.md5(content.encode('utf-8')).hexdigest())
+
+    @staticmethod
+    def _timestamp(value):
+        if isinstance(value, datetime.datetime):
+            return calendar.timegm(value.utctimetuple())
+        return None
+
+    def _not_modified(self, etag, last_modified=None):
+        response = get_conditional_response(
+            self.request,
+            etag=etag,
+            last_modified=last_modified
+        )
+        if response is not None:
+            self._conditional_headers(response, etag, last_modified)
+        return response
+
+    @staticmethod
+    def _conditional_headers(response, etag, last_modified=None):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def _payload_response(self, response):
+        if response.status_code != 200:
+            return response
+        etag = self._etag(json.dumps(response.data, cls=JSONEncoder, sort_keys=True))
+        return self._not_modified(etag) or self._conditional_headers(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.conditional_field is None:
+            return self._payload_response(
+                super(ConditionalMixin, self).retrieve(request, *args, **kwargs)
+            )
+        instance = self.get_object()
+        version = getattr(instance, self.conditional_field)
+        etag = self._etag(instance.pk, version)
+        last_modified = self._timestamp(version)
+        not_modified = self._not_modified(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        return self._conditional_headers(Response(serializer.data), etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        if self.conditional_field is None:
+            return self._payload_response(
+                super(ConditionalMixin, self).list(request, *args, **kwargs)
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        # Saving a row moves its timestamp past the latest one, but an incremented version may stay below the highest
+        field = queryset.model._meta.get_field(self.conditional_field)
+        state = queryset.aggregate(
+            version=Max(field.name) if isinstance(field, DateTimeField) else Sum(field.name),
+            count=Count('pk')
+        )
+        etag = self._etag(state['version'], state['count'])
+        last_modified = self._timestamp(state['version'])
+        not_modified = self._not_modified(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return self._conditional_headers(
+            super(ConditionalMixin, self).list(request, *args, **kwargs),
+            etag,
+            last_modified
+        )
+
+
+class CacheMixin(object):
+    cache_alias = 'default'
+    cache_timeout = 300
+    cache_per_user = False
+    cache_related = ()
+
+    @classmethod
+    def _cache_token(cls, name, renew=False):
+        cache = caches[cls.cache_alias]
+        key = 'drg:%s:%s' % (cls.queryset.model._meta.label_lower, name)
+        if renew:
+            cache.set(key, uuid.uuid4().hex, None)
+            return None
+        token = cache.get(key)
+        if token is None:
+            cache.add(key, uuid.uuid4().hex, None)
+            token = cache.get(key)
+        return token
+
+    @classmethod
+    def _cache_lookup(cls, value):
+        field = cls.queryset.model._meta.get_field(cls.lookup_field)
+        return 'object:%s' % field.to_python(value)
+
+    @classmethod
+    def connect_cache_invalidation(cls):
+        def invalidate_object(sender, instance, **kwargs):
+            cls._cache_token(cls._cache_lookup(getattr(instance, cls.lookup_field)), True)
+            cls._cache_token('list', True)
+
+        def invalidate_model(sender, **kwargs):
+            cls._cache_token('model', True)
+
+        def invalidate_relations(sender, instance, action, **kwargs):
+            if not action.startswith('post_'):
+                return
+            if isinstance(instance, model):
+                invalidate_object(sender, instance)
+            else:
+                invalidate_model(sender)
+
+        def invalidate_permissions(sender, instance, **kwargs):
+            if instance.content_type_id == ContentType.objects.get_for_model(model).pk:
+                invalidate_model(sender)
+
+        model = cls.queryset.model
+        uid = '%s.%s' % (cls.__module__, cls.__name__)
+        post_save.connect(invalidate_object, sender=model, weak=False, dispatch_uid='%s.save' % uid)
+        post_delete.connect(invalidate_object, sender=model, weak=False, dispatch_uid='%s.delete' % uid)
+        for through in cls._cache_through_models(model):
+            m2m_changed.connect(
+                invalidate_relations,
+                sender=through,
+                weak=False,
+                dispatch_uid='%s.%s.m2m' % (uid, through._meta.label_lower)
+            )
+        # Object permissions given or removed with guardian change what the users may see
+        if apps.is_installed('guardian'):
+            for label in ('guardian.UserObjectPermission', 'guardian.GroupObjectPermission'):
+                permission = apps.get_model(label)
+                post_save.connect(
+                    invalidate_permissions,
+                    sender=permission,
+                    weak=False,
+                    dispatch_uid='%s.%s.save' % (uid, label)
+                )
+                post_delete.connect(
+                    invalidate_permissions,
+                    sender=permission,
+                    weak=False,
+                    dispatch_uid='%s.%s.delete' % (uid, label)
+                )
+        for label in cls.cache_related:
+            related = apps.get_model(label)
+            for through in cls._cache_through_models(related):
+                m2m_changed.connect(
+                    invalidate_model,
+                    sender=through,
+                    weak=False,
+                    dispatch_uid='%s.%s.%s.m2m' % (uid, label, through._meta.label_lower)
+                )
+            post_save.connect(
+                invalidate_model,
+                sender=related,
+                weak=False,
+                dispatch_uid='%s.%s.save' % (uid, label)
+            )
+            post_delete.connect(
+                invalidate_model,
+                sender=related,
+                weak=False,
+                dispatch_uid='%s.%s.delete' % (uid, label)
+            )
+
+    @staticmethod
+    def _cache_through_models(model):
+        throughs = [field.remote_field.through for field in model._meta.many_to_many]
+        throughs += [relation.through for relation in model._meta.related_objects if relation.many_to_many]
+        return throughs
+
+    def _cache_key(self, name):
+        parts = [
+            self._cache_token('model'),
+            self._cache_token(name),
+            self.request.build_absolute_uri(),
+            self.request.META.get('HTTP_ACCEPT', ''),
+        ] + [
+            '%s.%s' % (permission.__module__, permission.__name__)
+            for permission in self.permission_classes
+        ]
+        if self.cache_per_user:
+            parts.append(str(self.request.user.pk))
+        return 'drg:%s:%s' % (
+            self.queryset.model._meta.label_lower,
+            hashlib.md5("|".join(parts).encode('utf-8')).hexdigest()
+        )
+
+    def _cached_response(self, key, method, request, *args, **kwargs):
+        cache = caches[self.cache_alias]
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = method(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        method = super(CacheMixin, self).retrieve
+        try:
+            name = self._cache_lookup(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except ValidationError:
+            return method(request, *args, **kwargs)
+        if _checks_objects(self):
+            # The cached response may have been built for a user allowed to see the object. Its relations are not
+            # needed to check the permissions, and a cache miss loads them again anyway
+            queryset = self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(None)
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            instance = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            self.check_object_permissions(request, instance)
+        return self._cached_response(self._cache_key(name), method, request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(
+            self._cache_key('list'),
+            super(CacheMixin, self).list,
+            request,
+            *args,
+            **kwargs
+        )
+
+
+def get_field_converters(serializer_class, fields=None, columns=False):
+    """
+    Return ``(name, attribute, related, to_representation)`` for the given fields of ``serializer_class``.
+
+    Fields are only built once per serializer class. Related fields are read from their column
+    (``author_id``) and converted from a ``PKOnlyObject``, just as DRF does for primary key relations ; fields that
+    can not be read from a single column (many to many and reverse relations) are left out.
+
+    With ``columns``, ``attribute`` is a column usable with ``values()`` and ``None`` is returned when one of the
+    readable fields can not be read that way (nested serializers, method fields, properties...).
+    """
+    cache = serializer_class.__dict__.get('_drg_converters')
+    if cache is None:
+        cache = {}
+        serializer = serializer_class()
+        meta = serializer_class.Meta.model._meta
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = meta.get_field(field.source)
+            except FieldDoesNotExist:
+                model_field = None
+            column = model_field is not None and model_field.concrete and not model_field.many_to_many
+            if isinstance(field, relations.ManyRelatedField):
+                cache[name] = None
+            elif isinstance(field, relations.RelatedField):
+                cache[name] = (name, model_field.attname, True, field.to_representation, True) if column else None
+            else:
+                cache[name] = (name, field.source, False, field.to_representation, column and not isinstance(
+                    field,
+                    serializers.BaseSerializer
+                ))
+        serializer_class._drg_converters = cache
+    converters = [cache[name] for name in cache if fields is None or name in fields]
+    if columns and not all(converter is not None and converter[4] for converter in converters):
+        return None
+    return [converter[:4] for converter in converters if converter is not None]
+
+
+class SummarySerializerMixin(object):
+    """
+    Read-only serializer for list actions, exposing ``Meta.fields`` of the detail serializer ``Meta.serializer``.
+
+    Rows are read with plain attribute access and converted by the detail serializer's fields, so values are
+    represented the same way in both serializers.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super(SummarySerializerMixin, self).__init__(*args, **kwargs)
+        self.converters = get_field_converters(
+            self.Meta.serializer,
+            [field for field in self.Meta.fields if fields is None or field in fields]
+        )
+
+    def to_representation(self, instance):
+        row = {}
+        for name, attribute, related, convert in self.converters:
+            value = getattr(instance, attribute)
+            if value is None:
+                row[name] = None
+            else:
+                row[name] = convert(relations.PKOnlyObject(pk=value) if related else value)
+        return row
+
+
+class ListSerializerMixin(object):
+    list_serializer_class = None
+
+    def get_serializer_class(self):
+        if self.action == 'list' and self.list_serializer_class is not None:
+            return self.list_serializer_class
+        return super(ListSerializerMixin, self).get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super(ListSerializerMixin, self).filter_queryset(queryset)
+        if self.action == 'list' and self.list_serializer_class is not None:
+            queryset = queryset.select_related(None).prefetch_related(None)
+        return queryset
+
+
+class ValuesMixin(object):
+    """
+    Serve list and retrieve actions from ``values()`` rows instead of model instances.
+
+    Rows are converted by the fields of the serializer the action would use, so responses are the same as with the
+    regular path, which is still used when a returned field can not be read from a column or when the permissions
+    have to check the object itself.
+    """
+
+    def _values_converters(self):
+        serializer_class = self.get_serializer_class()
+        fields = None
+        if issubclass(serializer_class, SummarySerializerMixin):
+            fields = serializer_class.Meta.fields
+            serializer_class = serializer_class.Meta.serializer
+        sparse = self.get_sparse_fields() if hasattr(self, 'get_sparse_fields') else None
+        if sparse is not None:
+            fields = [field for field in fields or sparse if field in sparse]
+        return get_field_converters(serializer_class, fields, columns=True)
+
+    def _values_queryset(self, queryset, converters):
+        columns = [attribute for _, attribute, _, _ in converters]
+        # Cursor pagination reads the position from the ordering column of the last row
+        ordering = getattr(self, 'ordering', None) or getattr(self.paginator, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        columns += [field.lstrip('-') for field in ordering if field.lstrip('-') not in columns]
+        return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+    @staticmethod
+    def _values_rows(rows, converters):
+        data = []
+        for values in rows:
+            row = {}
+            for name, attribute, related, convert in converters:
+                value = values[attribute]
+                if value is None:
+                    row[name] = None
+                else:
+                    row[name] = convert(relations.PKOnlyObject(pk=value) if related else value)
+            data.append(row)
+        return data
+
+    def list(self, request, *args, **kwargs):
+        converters = self._values_converters()
+        if converters is None:
+            return super(ValuesMixin, self).list(request, *args, **kwargs)
+        queryset = self._values_queryset(self.filter_queryset(self.get_queryset()), converters)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self._values_rows(page, converters))
+        return Response(self._values_rows(queryset, converters))
+
+    def retrieve(self, request, *args, **kwargs):
+        converters = self._values_converters()
+        if converters is None or _checks_objects(self):
+            return super(ValuesMixin, self).retrieve(request, *args, **kwargs)
+        queryset = self._values_queryset(self.filter_queryset(self.get_queryset()), converters)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return Response(self._values_rows([row], converters)[0])
+
+
+class ReplicaMixin(object):
+    """
+    Read safe requests from a replica through ``databases.ReplicaRouter``.
+
+    After a write, the client (user, or address for anonymous users) stays on the primary database for
+    ``replica_sticky_seconds``, so that it reads its own writes even if replicas lag behind.
+    """
+    replica_cache_alias = 'default'
+    replica_sticky_seconds = 5
+
+    @staticmethod
+    def _sticky_key(request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            client = 'user:%s' % user.pk
+        else:
+            client = 'address:%s' % request.META.get('REMOTE_ADDR', '')
+        return 'drg:primary:%s' % client
+
+    def perform_authentication(self, request):
+        super(ReplicaMixin, self).perform_authentication(request)
+        databases.start_request(
+            request.method in permissions.SAFE_METHODS and
+            not caches[self.replica_cache_alias].get(self._sticky_key(request))
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            response = super(ReplicaMixin, self).dispatch(request, *args, **kwargs)
+        finally:
+            written = databases.end_request()
+        if written and response.status_code < 400:
+            caches[self.replica_cache_alias].set(self._sticky_key(self.request), True, self.replica_sticky_seconds)
+        return response
@@ -0,0 +1,31 @@
+from rest_framework import pagination
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, 'ordering', None)
+        if ordering and not queryset.ordered:
+            queryset = queryset.order_by(*ordering)
+        return super(
+            PageNumberPagination,
+            self
+        ).paginate_queryset(queryset, request, view)
+
+
+class CursorPagination(pagination.CursorPagination):
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'ordering', None)
+        if ordering is not None:
+            self.ordering = ordering
+        return super(
+            CursorPagination,
+            self
+        ).get_ordering(request, queryset, view)
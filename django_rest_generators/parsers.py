@@ -0,0 +1,46 @@
+import codecs
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+from django_rest_generators import renderers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class JSONParser(parsers.JSONParser):
+    """
+    Parse UTF-8 JSON with ``orjson`` when it is installed, and with DRF's parser otherwise.
+
+    Integers larger than 64 bits are parsed as floats by ``orjson``.
+    """
+    renderer_class = renderers.JSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super(JSONParser, self).parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackParser(parsers.BaseParser):
+    media_type = 'application/msgpack'
+    renderer_class = renderers.MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        assert msgpack is not None, 'MessagePackParser requires msgpack to be installed'
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except ValueError as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
@@ -1,7 +1,95 @@
+from django.http import Http404
+from guardian.core import ObjectPermissionChecker
 from rest_framework import permissions
 
 
-class DjangoModelPermissionsWithRead(permissions.DjangoModelPermissions):
+def get_object_permission_checker(request):
+    checker = getattr(request, '_drg_permission_checker', None)
+    if checker is None:
+        checker = ObjectPermissionChecker(request.user)
+        request._drg_permission_checker = checker
+    return checker
+
+
+def get_permission_decisions(request):
+    decisions = getattr(request, '_drg_permission_decisions', None)
+    if decisions is None:
+        decisions = {}
+        request._drg_permission_decisions = decisions
+    return decisions
+
+
+class MemoizedPermissionsMixin(object):
+    _resolved_permissions = {}
+
+    def _resolve_permissions(self, resolver, method, model_cls):
+        key = (self.__class__, resolver.__name__, method, model_cls)
+        perms = self._resolved_permissions.get(key)
+        if perms is None:
+            perms = tuple(resolver(method, model_cls))
+            self._resolved_permissions[key] = perms
+        return perms
+
+    def get_required_permissions(self, method, model_cls):
+        return self._resolve_permissions(
+            super(MemoizedPermissionsMixin, self).get_required_permissions,
+            method,
+            model_cls
+        )
+
+    def get_permission_decisions(self, request):
+        return get_permission_decisions(request)
+
+    def _has_perms(self, request, perms, obj=None):
+        decisions = self.get_permission_decisions(request)
+        key = (request.user.pk, perms, None if obj is None else (obj.__class__, obj.pk))
+        if key not in decisions:
+            if obj is None or not request.user.is_authenticated:
+                decisions[key] = request.user.has_perms(perms, obj)
+            else:
+                checker = get_object_permission_checker(request)
+                decisions[key] = all(checker.has_perm(perm, obj) for perm in perms)
+        return decisions[key]
+
+    def has_permission(self, request, view):
+        if getattr(view, '_ignore_model_permissions', False):
+            return True
+        if not request.user or (not request.user.is_authenticated and self.authenticated_users_only):
+            return False
+        perms = self.get_required_permissions(request.method, self._queryset(view).model)
+        return self._has_perms(request, perms)
+
+
+class BatchedObjectPermissionsMixin(MemoizedPermissionsMixin):
+    def get_required_object_permissions(self, method, model_cls):
+        return self._resolve_permissions(
+            super(BatchedObjectPermissionsMixin, self).get_required_object_permissions,
+            method,
+            model_cls
+        )
+
+    def _has_object_perms(self, request, perms, obj):
+        return self._has_perms(request, perms, obj)
+
+    @staticmethod
+    def prefetch_object_permissions(request, objects):
+        if request.user.is_authenticated and objects:
+            get_object_permission_checker(request).prefetch_perms(objects)
+
+    def has_object_permission(self, request, view, obj):
+        model_cls = self._queryset(view).model
+        perms = self.get_required_object_permissions(request.method, model_cls)
+        if not self._has_object_perms(request, perms, obj):
+            if request.method in permissions.SAFE_METHODS:
+                raise Http404
+            read_perms = self.get_required_object_permissions('GET', model_cls)
+            if not self._has_object_perms(request, read_perms, obj):
+                raise Http404
+            return False
+        return True
+
+
+class DjangoModelPermissionsWithRead(MemoizedPermissionsMixin, permissions.DjangoModelPermissions):
     perms_map = {
         'GET': ['%(app_label)s.view_%(model_name)s'],
         'OPTIONS': ['%(app_label)s.view_%(model_name)s'],
@@ -13,7 +101,11 @@ class DjangoModelPermissionsWithRead(permissions.DjangoModelPermissions):
     }
 
 
-class DjangoObjectPermissionsWithRead(permissions.DjangoObjectPermissions):
+class DjangoObjectPermissions(BatchedObjectPermissionsMixin, permissions.DjangoObjectPermissions):
+    pass
+
+
+class DjangoObjectPermissionsWithRead(BatchedObjectPermissionsMixin, permissions.DjangoObjectPermissions):
     perms_map = {
         'GET': ['%(app_label)s.view_%(model_name)s'],
         'OPTIONS': ['%(app_label)s.view_%(model_name)s'],
@@ -25,8 +117,10 @@ class DjangoObjectPermissionsWithRead(permissions.DjangoObjectPermissions):
     }
 
 
-class DjangoObjectPermissionsOrAnonReadOnly(permissions.DjangoObjectPermissions):
+class DjangoObjectPermissionsOrAnonReadOnly(BatchedObjectPermissionsMixin, permissions.DjangoObjectPermissions):
     authenticated_users_only = False
+    # Objects are not checked for safe methods, views may skip loading them
+    checks_safe_objects = False
 
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
@@ -0,0 +1,55 @@
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    Render JSON with ``orjson`` when it is installed, and with DRF's renderer otherwise.
+
+    The output is the same, except for floats in exponent notation (``1e16`` instead of ``1e+16``). Indented, non
+    compact, ASCII only or non strict JSON is still rendered by DRF's renderer, as are payloads ``orjson`` can not
+    encode (integers larger than 64 bits for example).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or not self.compact or self.ensure_ascii or not self.strict or self.get_indent(
+                accepted_media_type,
+                renderer_context or {}
+        ) is not None:
+            return super(JSONRenderer, self).render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            )
+        except orjson.JSONEncodeError:
+            return super(JSONRenderer, self).render(data, accepted_media_type, renderer_context)
+        # Same javascript-safe escaping as DRF's renderer
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """Render MessagePack. Values JSON can not hold natively are converted as DRF's JSON encoder does."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder_class = renderers.JSONRenderer.encoder_class
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        assert msgpack is not None, 'MessagePackRenderer requires msgpack to be installed'
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self.encoder_class().default, use_bin_type=True)
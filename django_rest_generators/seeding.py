@@ -0,0 +1,134 @@
+import random
+from django.db import DEFAULT_DB_ALIAS, models
+from django_rest_generators import generators
+
+
+class Seeder(object):
+    """
+    Generate unsaved rows of a model, by batch, from the batch generators of ``django_rest_generators.generators``.
+
+    The same seed always gives the same rows, whatever the batch size. Unique fields (including ``unique_for_*`` fields
+    and one field of each unique set) get unique values, following the rows already in the table. Foreign keys point to
+    existing rows of the related model. Auto-filled fields, non-editable fields with a default and many-to-many
+    relations are left alone. A ``ValueError`` is raised if some rows can not be generated.
+    """
+
+    mapper_batches = {
+        models.BooleanField: generators.boolean_batch,
+        models.NullBooleanField: generators.boolean_batch,
+        models.CharField: generators.text_batch,
+        models.TextField: generators.text_batch,
+        models.EmailField: generators.email_batch,
+        models.SlugField: generators.slug_batch,
+        models.URLField: generators.url_batch,
+        models.UUIDField: generators.uuid_batch,
+        models.GenericIPAddressField: generators.ip_batch,
+        models.IntegerField: generators.integer_batch,
+        models.SmallIntegerField: generators.integer_batch,
+        models.PositiveIntegerField: generators.integer_batch,
+        models.PositiveSmallIntegerField: generators.integer_batch,
+        models.BigIntegerField: generators.integer_batch,
+        models.FloatField: generators.float_batch,
+        models.DateTimeField: generators.datetime_batch,
+        models.DateField: generators.date_batch
+    }
+
+    # Foreign keys point to a random row among the first ones of the related table
+    related_sample = 100000
+
+    # Share of generated None values for nullable fields
+    null_ratio = 0.1
+
+    def __init__(self, model, rows, seed='0', database=DEFAULT_DB_ALIAS):
+        self.model = model
+        self.rows = rows
+        self.seed = seed
+        self.database = database
+        self.manager = model._base_manager.using(database)
+        # Keep unique values unique when the table is seeded more than once
+        self.first = self.manager.count()
+        self.columns = self._columns(self.first + rows)
+
+    def batches(self, batch_size):
+        """Yield lists of at most ``batch_size`` unsaved rows. Only one of them is kept in memory at a time."""
+        for start in range(0, self.rows, batch_size):
+            yield self._batch(self.first + start, min(batch_size, self.rows - start))
+
+    def _unique_fields(self):
+        meta = self.model._meta
+        unique = set()
+        sets = [list(together) for together in meta.unique_together]
+        sets += [list(constraint.fields) for constraint in meta.constraints
+                 if isinstance(constraint, models.UniqueConstraint) and constraint.fields]
+        for field in meta.concrete_fields:
+            if field.unique or field.unique_for_date or field.unique_for_month or field.unique_for_year:
+                unique.add(field.name)
+        # One unique field is enough to keep a set unique
+        for names in sets:
+            if unique.intersection(names):
+                continue
+            fields = [meta.get_field(name) for name in names]
+            unique.add(next((field.name for field in fields if not field.is_relation), names[0]))
+        return unique
+
+    def _columns(self, last):
+        """Return a ``(attname, batch)`` pair per seeded field, ``batch(start, count)`` giving the values of a batch."""
+        unique = self._unique_fields()
+        columns = []
+        for field in self.model._meta.concrete_fields:
+            if isinstance(field, models.AutoField) or (not field.editable and field.has_default()) or \
+                    getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                continue
+            if field.is_relation:
+                batch = self._related_batch(field, field.name in unique, last)
+            elif type(field) in self.mapper_batches:
+                batch = self._field_batch(field, field.name in unique, last)
+            elif field.null or field.has_default():
+                continue
+            else:
+                raise ValueError('Can not generate values for %s (%s)' % (field.name, type(field).__name__))
+            columns.append((field.attname, self._nullable(field, field.name in unique, batch)))
+        return columns
+
+    def _field_batch(self, field, unique, last):
+        generator = self.mapper_batches[type(field)]
+        # Check that the last row fits before inserting anything
+        generator(field, random.Random(), last - 1, 1, unique)
+        return lambda rng, start, count: generator(field, rng, start, count, unique)
+
+    def _related_batch(self, field, unique, last):
+        related = field.related_model._base_manager.using(self.database).order_by(field.target_field.attname)
+        if unique or field.one_to_one:
+            values = list(related.values_list(field.target_field.attname, flat=True)[:last])
+            if len(values) < last:
+                raise ValueError('%s needs %d %s rows to hold unique values' % (
+                    field.name,
+                    last,
+                    field.related_model._meta.label
+                ))
+            return lambda rng, start, count: values[start:start + count]
+        values = list(related.values_list(field.target_field.attname, flat=True)[:self.related_sample])
+        if not values:
+            if field.null:
+                return lambda rng, start, count: [None] * count
+            raise ValueError('%s needs %s rows, seed it first' % (field.name, field.related_model._meta.label))
+        return lambda rng, start, count: [rng.choice(values) for _ in range(count)]
+
+    def _nullable(self, field, unique, batch):
+        rng = random.Random('%s:%s' % (self.seed, field.name))
+        if not field.null or unique:
+            return lambda start, count: batch(rng, start, count)
+        # Separate generator, so that the values do not depend on the batch size
+        null_rng = random.Random('%s:%s:null' % (self.seed, field.name))
+
+        def nullable_batch(start, count):
+            values = batch(rng, start, count)
+            return [None if null_rng.random() < self.null_ratio else value for value in values]
+        return nullable_batch
+
+    def _batch(self, start, count):
+        if not self.columns:
+            return [self.model() for _ in range(count)]
+        names = [attname for attname, _ in self.columns]
+        values = [batch(start, count) for _, batch in self.columns]
+        return [self.model(**dict(zip(names, row))) for row in zip(*values)]
@@ -2,6 +2,7 @@ from behave import use_step_matcher, given
 from django.apps import apps
 from django.contrib.auth import get_user_model
 from guardian.shortcuts import assign_perm
+from django_rest_generators.environment import fixture
 
 
 use_step_matcher("re")
@@ -26,6 +27,7 @@ def given_i_am_not_logged_in(context):
 
 
 @given(r"a basic set of users exists in the database")
+@fixture
 def basic_set_of_users_exists_in_the_database(context):
     """
     :type context: behave.runner.Context
@@ -44,6 +46,7 @@ def basic_set_of_users_exists_in_the_database(context):
 
 
 @given(r'a super administrator exists in the database')
+@fixture
 def a_super_administrator_exists_in_the_database(context):
     user_model = get_user_model()
     user_model.objects.create(
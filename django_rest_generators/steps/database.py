@@ -1,5 +1,8 @@
 from behave import use_step_matcher, given, then
 from django.apps import apps
+from django.db import transaction
+from django_rest_generators.databases import get_primary_database, get_replica_databases
+from django_rest_generators.seeding import Seeder
 
 
 use_step_matcher("re")
@@ -35,3 +38,44 @@ def then_no_model_exists(context, model_name, key, value):
     }
     obj = model.objects.filter(**args)
     assert len(obj) == 0
+
+
+@given(r"(?P<count>[0-9]+) (?P<model_name>[a-zA-Z0-9_.]+) exist in the database")
+def given_count_objects_exist(context, count, model_name):
+    """
+    Insert generated objects of a model (see ``django_rest_generators.seeding.Seeder``), by batch, in one transaction.
+
+    :type count: str
+    :type model_name: str
+    :type context: behave.runner.Context
+    """
+    seeder = Seeder(apps.get_model(model_name), int(count), database=get_primary_database())
+    with transaction.atomic(using=seeder.database):
+        for objects in seeder.batches(1000):
+            seeder.manager.bulk_create(objects)
+
+
+@given(r"the replicas lag behind the primary database")
+def given_the_replicas_lag_behind(context):
+    """
+    Send the requests of the scenario to the real replica databases. By default, they read the primary database, as
+    up to date replicas would.
+
+    :type context: behave.runner.Context
+    """
+    context.apiReplicasLag = True
+
+
+@given(r"the (?P<model_name>[a-zA-Z0-9_.]+) objects are replicated")
+def given_the_objects_are_replicated(context, model_name):
+    """
+    Copy every object of a model from the primary database to the replicas, as replication would.
+
+    :type model_name: str
+    :type context: behave.runner.Context
+    """
+    manager = apps.get_model(model_name)._base_manager
+    objects = list(manager.using(get_primary_database()).all())
+    for alias in get_replica_databases():
+        manager.using(alias).all().delete()
+        manager.using(alias).bulk_create(objects)
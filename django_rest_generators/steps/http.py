@@ -1,9 +1,25 @@
 import json
+import time
+from contextlib import ExitStack, contextmanager
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import urlencode
 from behave import use_step_matcher, when, then
+from django_rest_generators.databases import get_primary_database, get_replica_databases
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 
 use_step_matcher("re")
 
+MEDIA_TYPES = {
+    'json': 'application/json',
+    'msgpack': 'application/msgpack',
+}
+
 
 @when(r"i prepare a request to (?P<location>[a-zA-Z0-9\-_/.]+)")
 def when_i_prepare_a_request(context, location):
@@ -14,6 +30,9 @@ def when_i_prepare_a_request(context, location):
     context.apiRequestData = {
         'url': location,
         'params': {},
+        'query': {},
+        'elements': [],
+        'headers': {},
         'content-type': 'application/json',
         'format': 'json'
     }
@@ -29,6 +48,81 @@ def when_i_provide(context, key, value):
     context.apiRequestData['params'][key] = value
 
 
+@when(r"i set the query parameter (?P<key>[a-zA-Z0-9\-_]+) to (?P<value>.+)")
+def when_i_set_the_query_parameter(context, key, value):
+    """
+    :type key: str
+    :type value: str
+    :type context: behave.runner.Context
+    """
+    context.apiRequestData['query'][key] = value
+
+
+@when(r"i set (?P<key>[a-zA-Z0-9\-_]+) to (?P<value>.+) in element (?P<index>[0-9]+)")
+def when_i_set_in_element(context, key, value, index):
+    """
+    :type key: str
+    :type value: str
+    :type index: str
+    :type context: behave.runner.Context
+    """
+    elements = context.apiRequestData['elements']
+    index = int(index)
+    while len(elements) <= index:
+        elements.append({})
+    elements[index][key] = value
+
+
+@when(r"i add an empty element to the request")
+def when_i_add_an_empty_element(context):
+    """
+    :type context: behave.runner.Context
+    """
+    context.apiRequestData['elements'].append({})
+
+
+@when(r"i use the (?P<fmt>json|msgpack) format")
+def when_i_use_the_format(context, fmt):
+    """
+    :type fmt: str
+    :type context: behave.runner.Context
+    """
+    assert fmt != 'msgpack' or msgpack is not None, 'msgpack must be installed to send MessagePack requests'
+    context.apiRequestData['content-type'] = MEDIA_TYPES[fmt]
+    context.apiRequestData['format'] = fmt
+    context.apiRequestData['headers']['HTTP_ACCEPT'] = MEDIA_TYPES[fmt]
+
+
+@when(r"i set the header (?P<header>[a-zA-Z0-9\-]+) to (?P<value>.+)")
+def when_i_set_the_header(context, header, value):
+    """
+    :type header: str
+    :type value: str
+    :type context: behave.runner.Context
+    """
+    context.apiRequestData['headers'][
+        'HTTP_%s' % header.upper().replace('-', '_')
+    ] = value
+
+
+@when(r"i send the remembered etag")
+def when_i_send_the_remembered_etag(context):
+    """
+    :type context: behave.runner.Context
+    """
+    when_i_set_the_header(context, 'If-None-Match', context.apiETag)
+
+
+@when(r"i follow the next page link")
+def when_i_follow_the_next_page_link(context):
+    """
+    :type context: behave.runner.Context
+    """
+    location = _returned_data(context)['next']
+    assert location is not None
+    when_i_prepare_a_request(context, location)
+
+
 @when(r"i send the request using (?P<method>POST|GET|PUT|PATCH|DELETE)")
 def when_i_send_the_request(context, method):
     """
@@ -36,13 +130,57 @@ def when_i_send_the_request(context, method):
     :type context: behave.runner.Context
     """
     data = context.apiRequestData
-    context.apiRequest = context.apiClient.generic(
-        method,
-        data['url'],
-        data=json.dumps(data['params']),
-        content_type=data['content-type'],
-        format=data['format'],
-    )
+    url = data['url']
+    if data['query']:
+        url = "%s%s%s" % (
+            url,
+            '&' if '?' in url else '?',
+            urlencode(data['query'])
+        )
+    with ExitStack() as stack:
+        captures = [stack.enter_context(CaptureQueriesContext(connection)) for connection in connections.all()]
+        start = time.perf_counter()
+        with _synchronous_replicas(context):
+            context.apiRequest = context.apiClient.generic(
+                method,
+                url,
+                data=_encode(data['format'], data['elements'] or data['params']),
+                content_type=data['content-type'],
+                format=data['format'],
+                **data['headers']
+            )
+        context.apiDuration = time.perf_counter() - start
+    context.apiQueries = [query['sql'] for capture in captures for query in capture.captured_queries]
+
+
+@contextmanager
+def _synchronous_replicas(context):
+    if getattr(context, 'apiReplicasLag', False):
+        yield
+        return
+    replicas = dict((alias, connections[alias]) for alias in get_replica_databases())
+    for alias in replicas:
+        connections[alias] = connections[get_primary_database()]
+    try:
+        yield
+    finally:
+        for alias, connection in replicas.items():
+            connections[alias] = connection
+
+
+def _encode(fmt, payload):
+    if fmt == 'msgpack':
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload)
+
+
+def _returned_data(context):
+    response = context.apiRequest
+    if response.get('Content-Type', '').split(';')[0] != MEDIA_TYPES['msgpack']:
+        return response.data
+    if not hasattr(response, 'decoded_data'):
+        response.decoded_data = msgpack.unpackb(response.content, raw=False, strict_map_key=False)
+    return response.decoded_data
 
 
 @then(r"the return code is (?P<code>[0-9]+)")
@@ -54,6 +192,36 @@ def then_the_return_code_is(context, code):
     assert context.apiRequest.status_code == int(code)
 
 
+@then(r"the request executed at most (?P<cnt>[0-9]+) queries")
+def then_the_request_executed_at_most_queries(context, cnt):
+    """
+    :type cnt: str
+    :type context: behave.runner.Context
+    """
+    assert len(context.apiQueries) <= int(cnt), "%d queries executed :\n%s" % (
+        len(context.apiQueries),
+        "\n".join(context.apiQueries)
+    )
+
+
+@then(r"the request completed in under (?P<ms>[0-9]+) ms")
+def then_the_request_completed_in_under(context, ms):
+    """
+    :type ms: str
+    :type context: behave.runner.Context
+    """
+    assert context.apiDuration * 1000 < int(ms), "completed in %d ms" % (context.apiDuration * 1000)
+
+
+@then(r"i remember the returned etag")
+def then_i_remember_the_returned_etag(context):
+    """
+    :type context: behave.runner.Context
+    """
+    assert context.apiRequest.has_header('ETag')
+    context.apiETag = context.apiRequest['ETag']
+
+
 @then(r"the return value for (?P<key>[a-zA-Z0-9\-_]+) is (?P<value>.+)")
 def then_the_return_value_for_is(context, key, value):
     """
@@ -61,8 +229,19 @@ def then_the_return_value_for_is(context, key, value):
     :type value: str
     :type context: behave.runner.Context
     """
-    assert key in context.apiRequest.data
-    assert str(context.apiRequest.data[key]) == str(value)
+    assert key in _returned_data(context)
+    assert str(_returned_data(context)[key]) == str(value)
+
+
+@then(r"the returned error for (?P<key>[a-zA-Z0-9\-_]+) is (?P<value>.+)")
+def then_the_returned_error_for_is(context, key, value):
+    """
+    :type key: str
+    :type value: str
+    :type context: behave.runner.Context
+    """
+    assert key in _returned_data(context)
+    assert value in [str(error) for error in _returned_data(context)[key]]
 
 
 @then(r"the returned array contain (?P<cnt>[0-9]+) elements")
@@ -71,7 +250,25 @@ def then_the_returned_array_contain_elements(context, cnt):
     :type cnt: str
     :type context: behave.runner.Context
     """
-    assert len(context.apiRequest.data) == int(cnt)
+    assert len(_returned_data(context)) == int(cnt)
+
+
+@then(r"the returned page contain (?P<cnt>[0-9]+) elements")
+def then_the_returned_page_contain_elements(context, cnt):
+    """
+    :type cnt: str
+    :type context: behave.runner.Context
+    """
+    assert 'results' in _returned_data(context)
+    assert len(_returned_data(context)['results']) == int(cnt)
+
+
+@then(r"there is no next page")
+def then_there_is_no_next_page(context):
+    """
+    :type context: behave.runner.Context
+    """
+    assert _returned_data(context)['next'] is None
 
 
 @then(r"the returned element (?P<line>[0-9]+) have a"
@@ -84,11 +281,90 @@ def then_then_returned_element_have_a_key(context, line, key, value):
     :type context: behave.runner.Context
     """
     line = int(line)
-    data = context.apiRequest.data
+    data = _returned_data(context)
     assert 0 <= line < len(data)
     row = data[line]
     assert key in row
-    assert row[key] == value
+    assert str(row[key]) == str(value)
+
+
+@then(r"the returned element (?P<line>[0-9]+) have a"
+      r" key named (?P<key>[a-zA-Z0-9_]+) which is not null")
+def then_the_returned_element_have_a_non_null_key(context, line, key):
+    """
+    :type line: str
+    :type key: str
+    :type context: behave.runner.Context
+    """
+    line = int(line)
+    data = _returned_data(context)
+    assert 0 <= line < len(data)
+    assert data[line].get(key) is not None
+
+
+@then(r"the returned page element (?P<line>[0-9]+) have a"
+      r" key named (?P<key>[a-zA-Z0-9_]+) with value (?P<value>.+)")
+def then_the_returned_page_element_have_a_key(context, line, key, value):
+    """
+    :type line: str
+    :type key: str
+    :type value: str
+    :type context: behave.runner.Context
+    """
+    line = int(line)
+    data = _returned_data(context)['results']
+    assert 0 <= line < len(data)
+    row = data[line]
+    assert key in row
+    assert str(row[key]) == str(value)
+
+
+def _streamed_lines(context):
+    response = context.apiRequest
+    if not hasattr(response, 'streamed_lines'):
+        response.streamed_lines = b''.join(
+            response.streaming_content
+        ).decode('utf-8').splitlines()
+    return response.streamed_lines
+
+
+@then(r"the returned stream contain (?P<cnt>[0-9]+) lines")
+def then_the_returned_stream_contain_lines(context, cnt):
+    """
+    :type cnt: str
+    :type context: behave.runner.Context
+    """
+    assert len(_streamed_lines(context)) == int(cnt)
+
+
+@then(r"the returned stream line (?P<line>[0-9]+) have a"
+      r" key named (?P<key>[a-zA-Z0-9_]+) with value (?P<value>.+)")
+def then_the_returned_stream_line_have_a_key(context, line, key, value):
+    """
+    :type line: str
+    :type key: str
+    :type value: str
+    :type context: behave.runner.Context
+    """
+    line = int(line)
+    lines = _streamed_lines(context)
+    assert 0 <= line < len(lines)
+    row = json.loads(lines[line])
+    assert key in row
+    assert str(row[key]) == str(value)
+
+
+@then(r"the returned stream line (?P<line>[0-9]+) is (?P<value>.+)")
+def then_the_returned_stream_line_is(context, line, value):
+    """
+    :type line: str
+    :type value: str
+    :type context: behave.runner.Context
+    """
+    line = int(line)
+    lines = _streamed_lines(context)
+    assert 0 <= line < len(lines)
+    assert lines[line] == value
 
 
 @then(r"there is no (?P<key>[a-zA-Z0-9\-_]+) in the returned object")
@@ -97,7 +373,7 @@ def then_there_is_no(context, key):
     :param context: behave.runner.Context
     :param key: str
     """
-    assert key not in context.apiRequest.data
+    assert key not in _returned_data(context)
 
 
 @then(
@@ -111,6 +387,22 @@ def then_the_return_element_have_no_key(context, line, key):
     :param key: str
     """
     line = int(line)
-    data = context.apiRequest.data
+    data = _returned_data(context)
+    assert 0 <= line < len(data)
+    assert key not in data[line]
+
+
+@then(
+    r"the returned page element (?P<line>[0-9]+) have no"
+    r" key named (?P<key>[a-zA-Z0-9\-_]+)"
+)
+def then_the_returned_page_element_have_no_key(context, line, key):
+    """
+    :param context: behave.runner.Context
+    :param line: str
+    :param key: str
+    """
+    line = int(line)
+    data = _returned_data(context)['results']
     assert 0 <= line < len(data)
     assert key not in data[line]
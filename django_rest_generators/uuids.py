@@ -0,0 +1,30 @@
+import os
+import threading
+import time
+import uuid
+
+
+_lock = threading.Lock()
+_last = [0, 0]
+
+
+def uuid7():
+    """
+    Return a time-ordered UUID (version 7) : 48 bits of unix time in milliseconds, followed by random bits.
+
+    UUIDs generated by the same process are strictly increasing, so new rows are always appended at the end of the
+    primary key index instead of being scattered across it.
+    """
+    with _lock:
+        timestamp = int(time.time() * 1000)
+        if timestamp <= _last[0]:
+            timestamp = _last[0]
+            counter = _last[1] + 1
+            if counter > 0xfff:
+                timestamp += 1
+                counter = 0
+        else:
+            counter = int.from_bytes(os.urandom(2), 'big') & 0x7ff
+        _last[0], _last[1] = timestamp, counter
+    random = int.from_bytes(os.urandom(8), 'big') & 0x3fffffffffffffff
+    return uuid.UUID(int=(timestamp << 80) | (0x7 << 76) | (counter << 64) | (0x2 << 62) | random)
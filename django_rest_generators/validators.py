@@ -0,0 +1,96 @@
+from django.db import models
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.validators import (
+    UniqueValidator,
+    UniqueForDateValidator,
+    UniqueForMonthValidator,
+    UniqueForYearValidator
+)
+
+
+def column_value(field, value):
+    """Return ``value`` as ``values()`` reads it from the column of ``field`` : related objects are read as keys."""
+    if field.is_relation and isinstance(value, models.Model):
+        return getattr(value, field.target_field.attname)
+    return value
+
+
+class CombinedUniqueValidator(object):
+    requires_context = True
+    lookups = {
+        'date': ('day', 'month', 'year'),
+        'month': ('month',),
+        'year': ('year',),
+    }
+    messages = {
+        'date': UniqueForDateValidator.message,
+        'month': UniqueForMonthValidator.message,
+        'year': UniqueForYearValidator.message,
+    }
+
+    def __init__(self, queryset, fields=None, dates=None):
+        self.queryset = queryset
+        self.fields = fields or []
+        self.dates = dates or []
+
+    @staticmethod
+    def _value(attrs, instance, name):
+        if name in attrs:
+            return attrs[name]
+        return getattr(instance, name, None)
+
+    def _checks(self, attrs, instance):
+        checks = []
+        for field in self.fields:
+            value = self._value(attrs, instance, field)
+            if value is not None:
+                checks.append((None, field, None, value, None))
+        for kind, field, date_field in self.dates:
+            value = self._value(attrs, instance, field)
+            date = self._value(attrs, instance, date_field)
+            if value is not None and date is not None:
+                checks.append((kind, field, date_field, value, date))
+        return checks
+
+    def _matches(self, row, check):
+        kind, field, date_field, value, date = check
+        model_field = self.queryset.model._meta.get_field(field)
+        if row[model_field.attname] != column_value(model_field, value):
+            return False
+        if kind is None:
+            return True
+        return all(
+            getattr(row[date_field], part) == getattr(date, part)
+            for part in self.lookups[kind]
+        )
+
+    def __call__(self, attrs, serializer):
+        instance = getattr(serializer, 'instance', None)
+        checks = self._checks(attrs, instance)
+        if not checks:
+            return
+        query = Q()
+        names = set()
+        for kind, field, date_field, value, date in checks:
+            conditions = {field: value}
+            names.add(self.queryset.model._meta.get_field(field).attname)
+            if kind is not None:
+                names.add(date_field)
+                for part in self.lookups[kind]:
+                    conditions['%s__%s' % (date_field, part)] = getattr(date, part)
+            query |= Q(**conditions)
+        queryset = self.queryset.filter(query)
+        if instance is not None:
+            queryset = queryset.exclude(pk=instance.pk)
+        errors = {}
+        for row in queryset.values(*names):
+            for check in checks:
+                if self._matches(row, check):
+                    kind, field, date_field = check[:3]
+                    if kind is None:
+                        errors[field] = [UniqueValidator.message]
+                    else:
+                        errors[field] = [self.messages[kind].format(date_field=date_field)]
+        if errors:
+            raise serializers.ValidationError(errors, code='unique')
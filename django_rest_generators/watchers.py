@@ -0,0 +1,97 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class PollingWatcher(object):
+    """Wait for changes of the python files of a directory by comparing their modification times."""
+
+    def __init__(self, directory, interval=0.5):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self):
+        snapshot = {}
+        for name in os.listdir(self.directory):
+            if name.endswith('.py'):
+                path = os.path.join(self.directory, name)
+                try:
+                    snapshot[path] = os.stat(path).st_mtime
+                except OSError:
+                    pass
+        return snapshot
+
+    def wait(self):
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._snapshot()
+            changed = set(snapshot) ^ set(self.snapshot)
+            changed.update(
+                path for path, mtime in snapshot.items()
+                if path in self.snapshot and self.snapshot[path] != mtime
+            )
+            self.snapshot = snapshot
+            if changed:
+                return sorted(changed)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(object):
+    """Wait for changes of the python files of a directory using Linux inotify."""
+    mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, directory, debounce=0.05):
+        self.directory = directory
+        self.debounce = debounce
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        if libc.inotify_add_watch(self.fd, directory.encode(), self.mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), 'inotify_add_watch failed')
+
+    def _read(self, changed):
+        data = os.read(self.fd, 65536)
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode()
+            offset += length
+            if name.endswith('.py'):
+                changed.add(os.path.join(self.directory, name))
+
+    def wait(self):
+        changed = set()
+        while not changed:
+            self._read(changed)
+        # Editors usually touch a file several times when saving it
+        while select.select([self.fd], [], [], self.debounce)[0]:
+            self._read(changed)
+        return sorted(changed)
+
+    def close(self):
+        os.close(self.fd)
+
+
+def get_watcher(directory):
+    try:
+        return InotifyWatcher(directory)
+    except (AttributeError, OSError, TypeError):
+        return PollingWatcher(directory)